@@ -10,6 +10,10 @@ from telegram.ext import (
 )
 
 from handlers.register_handlers import register_handlers
+from utils.http_client import close_http_client
+from utils.parse_pool import shutdown_parse_pool
+from utils.json_store import flush_json_store
+from utils.state_db import close_state_db
 
 
 logger = logging.getLogger()
@@ -98,9 +102,22 @@ async def error_handler_function(update: Update, context: ContextTypes.DEFAULT_T
     logger.error("🚨 Terjadi error saat memproses update:", exc_info=context.error)
 
 
+async def post_shutdown(app: Application):
+    # Tulis data yang masih tertunda, lalu tutup koneksi HTTP & pool parser
+    await flush_json_store(app)
+    await close_state_db(app)
+    await close_http_client(app)
+    await shutdown_parse_pool(app)
+
+
 # ===== Main Program =====
 def main():
-    application = Application.builder().token(TOKEN).build()
+    application = (
+        Application.builder()
+        .token(TOKEN)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
     application.add_error_handler(error_handler_function)
 
     # === Register Handlers ===
@@ -1,5 +1,3 @@
-import json
-import os
 import time
 import random
 import re
@@ -8,6 +6,7 @@ from telegram.ext import ContextTypes
 
 from handlers.moderasi import is_admin
 from utils.constants import AUTOREPLY_FILE
+from utils.json_store import baca_json, json_store
 
 
 class AutoreplyManager:
@@ -19,15 +18,13 @@ class AutoreplyManager:
         self.last_reply_ts = {}  # { (chat_id, user_id): timestamp }
 
     def _load(self):
-        if not os.path.exists(self.json_path):
+        data = baca_json(self.json_path)
+        if data is None:
             return {"enabled": True, "chats": {}}
-        with open(self.json_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return data
 
     def _save(self):
-        os.makedirs(os.path.dirname(self.json_path), exist_ok=True)
-        with open(self.json_path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        json_store.jadwalkan(self.json_path, self.data, ensure_ascii=False, indent=2)
 
     def reload(self):
         self.data = self._load()
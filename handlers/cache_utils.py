@@ -1,14 +1,33 @@
 import os
 import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
 from datetime import datetime, timezone, timedelta
 
+from utils.state_db import state_db
+
+logger = logging.getLogger(__name__)
+
 CACHE_DIR = "data"
-CACHE_AUTO_FILE = os.path.join(CACHE_DIR, "eps_cache_auto.json")
-CACHE_MANUAL_FILE = os.path.join(CACHE_DIR, "eps_cache_manual.json")
+CACHE_AUTO_DIR = os.path.join(CACHE_DIR, "eps_cache_auto")
+CACHE_MANUAL_DIR = os.path.join(CACHE_DIR, "eps_cache_manual")
+AKUN_DEFAULT = "default"  # stream untuk format lama (list per uid)
+
+# === Retensi ===
+# Simpan N snapshot terakhir per akun (0 = tanpa batas) dan/atau hanya yang
+# berumur <= T hari (0 = tanpa batas). Snapshot terakhir selalu disimpan.
+SIMPAN_N = int(os.getenv("EPS_SNAPSHOT_KEEP", "20"))
+SIMPAN_HARI = float(os.getenv("EPS_SNAPSHOT_DAYS", "0"))
+# Shard dipadatkan saat baris basinya sudah sebanyak ini (amortized O(1)/append)
+MIN_BASI = max(SIMPAN_N, 20)
+INTERVAL_KOMPAKSI = 24 * 3600
 
 
-def _ensure_dir():
-    os.makedirs(CACHE_DIR, exist_ok=True)
+def _ensure_dir(path: str = CACHE_DIR):
+    os.makedirs(path, exist_ok=True)
 
 
 def _now_jakarta_iso() -> str:
@@ -16,53 +35,305 @@ def _now_jakarta_iso() -> str:
     return datetime.now(jkt).strftime("%Y-%m-%d %H:%M:%S %z")
 
 
-def _data_equal(a: dict, b: dict) -> bool:
-    try:
-        return json.dumps(a, sort_keys=True, ensure_ascii=False) == json.dumps(
-            b, sort_keys=True, ensure_ascii=False
-        )
-    except Exception:
-        return a == b
+def _hash_data(data) -> str:
+    """Hash kanonik snapshot; kesamaan data = kesamaan hash."""
+    teks = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(teks.encode("utf-8")).hexdigest()
 
 
-def _load_cache(path: str) -> dict:
-    _ensure_dir()
-    if not os.path.exists(path):
-        return {}
+def _epoch(entry: dict) -> float:
+    if "t" in entry:
+        return entry["t"]
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f) or {}
-    except Exception:
-        return {}
+        return datetime.strptime(entry["ts"], "%Y-%m-%d %H:%M:%S %z").timestamp()
+    except (KeyError, TypeError, ValueError):
+        return time.time()  # ts tidak terbaca: anggap baru, jangan dibuang
+
 
+def _baris(akun: str, entry: dict) -> bytes:
+    rekaman = {"akun": akun, **entry}
+    teks = json.dumps(rekaman, ensure_ascii=False, separators=(",", ":"))
+    return (teks + "\n").encode("utf-8")
 
-def _save_cache(path: str, cache: dict):
-    _ensure_dir()
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
 
+def _rekaman(data, ts: str | None = None, t: float | None = None) -> dict:
+    t = time.time() if t is None else t
+    return {"ts": ts or _now_jakarta_iso(), "t": t, "h": _hash_data(data), "data": data}
 
-def _get_last_snapshot_for_account(cache: dict, uid: int, account_key: str):
+
+class SnapshotLog:
     """
-    Struktur:
-      { "<uid>": { "<account_key>": [ {snapshot}, ... ] } }
-    Kompat lama (list per uid) tetap dibaca sebagai satu stream default.
+    Riwayat snapshot EPS per user & akun. Tiap user punya shard JSONL
+    append-only sendiri (<dir>/<uid>.jsonl), baris:
+      {"akun": "<account_key>", "ts": "...", "t": <epoch>, "h": "<hash>", "data": {...}}
+    Shard dibaca lazy saat user itu pertama kali diakses, jadi membaca satu
+    akun tidak mem-parse riwayat user lain. Di memori hanya disimpan
+    (t, hash, offset) per snapshot; "berubah?" cukup bandingkan hash dan
+    append selalu O(1) I/O. Retensi (SIMPAN_N / SIMPAN_HARI) ditegakkan
+    dengan memadatkan shard: otomatis saat barisnya cukup banyak yang basi,
+    dan berkala lewat kompaksi_semua() untuk batas umur.
     """
-    ukey = str(uid)
-    node = cache.get(ukey)
-    if not node:
-        return None
-    if isinstance(node, list):  # kompat lama
-        return node[-1] if node else None
-    hist = (node or {}).get(account_key) or []
-    return hist[-1] if hist else None
-
-
-def _append_snapshot_for_account(cache: dict, uid: int, account_key: str, entry: dict):
-    ukey = str(uid)
-    if ukey not in cache:
-        cache[ukey] = {}
-    if isinstance(cache[ukey], list):  # kompat lama → append ke list
-        cache[ukey].append(entry)
-        return
-    cache[ukey].setdefault(account_key, []).append(entry)
+
+    def __init__(self, directory: str):
+        self.dir = directory
+        # uid -> akun -> list (t, hash, offset), urut waktu
+        self._users: dict[str, dict[str, list]] = {}
+        self._basi: dict[str, int] = {}  # uid -> baris di luar retensi
+        self._migrated = False
+        # kompaksi berkala jalan di thread; jangan sampai bertabrakan dengan append
+        self._lock = threading.RLock()
+
+    def _path(self, ukey: str) -> str:
+        return os.path.join(self.dir, f"{ukey}.jsonl")
+
+    # === Load per user ===
+    def _user(self, ukey: str) -> dict[str, list]:
+        node = self._users.get(ukey)
+        if node is None:
+            self._migrasi_lama()
+            node = self._users[ukey] = self._scan(ukey)
+            self._basi[ukey] = self._hitung_basi(node)
+        return node
+
+    def _scan(self, ukey: str) -> dict[str, list]:
+        node: dict[str, list] = {}
+        path = self._path(ukey)
+        if not os.path.exists(path):
+            return node
+        with open(path, "rb+") as f:
+            posisi = 0
+            for baris in iter(f.readline, b""):
+                if not baris.endswith(b"\n"):
+                    # baris terakhir terpotong (crash saat menulis): buang
+                    f.truncate(posisi)
+                    break
+                try:
+                    entry = json.loads(baris)
+                    node.setdefault(entry["akun"], []).append((_epoch(entry), entry["h"], posisi))
+                except (ValueError, KeyError):
+                    logger.warning("Baris rusak di %s offset %d", path, posisi)
+                posisi += len(baris)
+        return node
+
+    # === Retensi & kompaksi ===
+    @staticmethod
+    def _disimpan(hist: list, sekarang: float) -> list:
+        """Bagian riwayat yang lolos retensi; snapshot terakhir selalu ikut."""
+        simpan = hist[-SIMPAN_N:] if SIMPAN_N > 0 else hist
+        if SIMPAN_HARI > 0:
+            batas = sekarang - SIMPAN_HARI * 86400
+            simpan = [e for e in simpan if e[0] >= batas] or hist[-1:]
+        return simpan
+
+    def _hitung_basi(self, node: dict, sekarang: float | None = None) -> int:
+        sekarang = sekarang or time.time()
+        return sum(len(h) - len(self._disimpan(h, sekarang)) for h in node.values())
+
+    def padatkan(self, uid) -> int:
+        """Tulis ulang shard user dengan snapshot yang lolos retensi. Return baris dibuang."""
+        with self._lock:
+            return self._padatkan(str(uid))
+
+    def _padatkan(self, ukey: str) -> int:
+        node = self._user(ukey)
+        sekarang = time.time()
+        simpan = {akun: self._disimpan(hist, sekarang) for akun, hist in node.items()}
+        dibuang = sum(len(node[a]) - len(s) for a, s in simpan.items())
+        if not dibuang:
+            self._basi[ukey] = 0
+            return 0
+
+        path = self._path(ukey)
+        tmp = path + ".tmp"
+        baru: dict[str, list] = {}
+        with open(path, "rb") as src, open(tmp, "wb") as dst:
+            # salin baris yang disimpan sesuai urutan aslinya di file
+            urutan = sorted((e[2], akun, e) for akun, hist in simpan.items() for e in hist)
+            for offset, akun, (t, h, _) in urutan:
+                src.seek(offset)
+                baris = src.readline()
+                baru.setdefault(akun, []).append((t, h, dst.tell()))
+                dst.write(baris)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp, path)
+        self._users[ukey] = baru
+        self._basi[ukey] = 0
+        return dibuang
+
+    def kompaksi_semua(self) -> int:
+        """Padatkan semua shard (retensi umur ikut ditegakkan). Return total baris dibuang."""
+        if not os.path.isdir(self.dir):
+            return 0
+        total = 0
+        for nama in os.listdir(self.dir):
+            if not nama.endswith(".jsonl"):
+                continue
+            ukey = nama[: -len(".jsonl")]
+            with self._lock:
+                dimuat = ukey in self._users
+                total += self._padatkan(ukey)
+                if not dimuat:
+                    # jangan menahan index user yang tidak sedang aktif di memori
+                    self._users.pop(ukey, None)
+                    self._basi.pop(ukey, None)
+        return total
+
+    # === Migrasi format lama ===
+    def _migrasi_lama(self):
+        """
+        Sekali jalan: pecah file lama ke shard per user.
+        <dir>.json (satu objek besar) dan <dir>.jsonl (satu log semua user).
+        """
+        if self._migrated:
+            return
+        self._migrated = True
+        for lama in (self.dir + ".json", self.dir + ".jsonl"):
+            if not os.path.exists(lama):
+                continue
+            try:
+                n = self._pecah(lama)
+            except Exception:
+                logger.exception("Gagal migrasi cache lama %s", lama)
+                continue
+            os.replace(lama, lama + ".bak")
+            if os.path.exists(lama + ".idx"):
+                os.remove(lama + ".idx")
+            logger.info("📦 %d snapshot dimigrasi dari %s ke %s/", n, lama, self.dir)
+
+    def _pecah(self, lama: str) -> int:
+        per_user: dict[str, list[bytes]] = {}
+        with open(lama, "r", encoding="utf-8") as f:
+            if lama.endswith(".jsonl"):
+                for baris in f:
+                    if not baris.strip():
+                        continue
+                    entry = json.loads(baris)
+                    ukey, akun = entry.pop("uid"), entry.pop("akun")
+                    entry.setdefault("t", _epoch(entry))
+                    per_user.setdefault(ukey, []).append(_baris(akun, entry))
+            else:
+                for ukey, node in (json.load(f) or {}).items():
+                    streams = {AKUN_DEFAULT: node} if isinstance(node, list) else node or {}
+                    for akun, hist in streams.items():
+                        for entry in hist or []:
+                            data = entry.get("data", entry)
+                            rekaman = _rekaman(data, entry.get("ts"), _epoch(entry))
+                            per_user.setdefault(ukey, []).append(_baris(akun, rekaman))
+        _ensure_dir(self.dir)
+        for ukey, baris in per_user.items():
+            with open(self._path(ukey), "ab") as f:
+                f.writelines(baris)
+        return sum(len(b) for b in per_user.values())
+
+    # === API ===
+    def berubah(self, uid: int, account_key: str, data: dict) -> bool:
+        """True kalau `data` beda dari snapshot terakhir akun ini."""
+        with self._lock:
+            hist = self._user(str(uid)).get(account_key)
+        return not hist or hist[-1][1] != _hash_data(data)
+
+    def catat(self, uid: int, account_key: str, data: dict) -> bool:
+        """Append snapshot kalau berubah. Return True kalau ditulis."""
+        rekaman = _rekaman(data)
+        with self._lock:
+            return self._catat(str(uid), account_key, rekaman)
+
+    def _catat(self, ukey: str, account_key: str, rekaman: dict) -> bool:
+        node = self._user(ukey)
+        hist = node.setdefault(account_key, [])
+        if hist and hist[-1][1] == rekaman["h"]:
+            return False
+        _ensure_dir(self.dir)
+        with open(self._path(ukey), "ab") as f:
+            offset = f.tell()
+            f.write(_baris(account_key, rekaman))
+        hist.append((rekaman["t"], rekaman["h"], offset))
+        if SIMPAN_N > 0 and len(hist) > SIMPAN_N:
+            self._basi[ukey] = self._basi.get(ukey, 0) + 1
+        if self._basi.get(ukey, 0) >= MIN_BASI:
+            self._padatkan(ukey)
+        return True
+
+    def _baca(self, ukey: str, offsets: list[int]) -> list[dict]:
+        hasil = []
+        with open(self._path(ukey), "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                entry = json.loads(f.readline())
+                hasil.append({"ts": entry["ts"], "data": entry["data"]})
+        return hasil
+
+    def terakhir(self, uid: int, account_key: str):
+        """Snapshot terakhir ({"ts", "data"}) lewat seek ke offset-nya."""
+        ukey = str(uid)
+        with self._lock:
+            hist = self._user(ukey).get(account_key)
+            return self._baca(ukey, [hist[-1][2]])[0] if hist else None
+
+    def riwayat(self, uid: int, account_key: str) -> list[dict]:
+        """Snapshot akun ini yang lolos retensi, lama → baru."""
+        ukey = str(uid)
+        with self._lock:
+            hist = self._user(ukey).get(account_key) or []
+            return self._baca(ukey, [e[2] for e in self._disimpan(hist, time.time())])
+
+
+class SqliteSnapshotLog:
+    """API sama dengan SnapshotLog, disimpan di tabel account_snapshots (STATE_BACKEND=sqlite)."""
+
+    def __init__(self, nama: str):
+        self.nama = nama
+        self.dir = f"{state_db.path}:{nama}"
+
+    def berubah(self, uid: int, account_key: str, data: dict) -> bool:
+        last = state_db.snapshot_terakhir(self.nama, str(uid), account_key)
+        return last is None or last["h"] != _hash_data(data)
+
+    def catat(self, uid: int, account_key: str, data: dict) -> bool:
+        ukey = str(uid)
+        rekaman = _rekaman(data)
+        last = state_db.snapshot_terakhir(self.nama, ukey, account_key)
+        if last is not None and last["h"] == rekaman["h"]:
+            return False
+        state_db.snapshot_tambah(self.nama, ukey, account_key, rekaman)
+        if SIMPAN_N > 0:
+            state_db.snapshot_pangkas_akun(self.nama, ukey, account_key, SIMPAN_N)
+        return True
+
+    def terakhir(self, uid: int, account_key: str):
+        last = state_db.snapshot_terakhir(self.nama, str(uid), account_key)
+        return {"ts": last["ts"], "data": json.loads(last["data"])} if last else None
+
+    def riwayat(self, uid: int, account_key: str) -> list[dict]:
+        rows = state_db.snapshot_riwayat(self.nama, str(uid), account_key)
+        return [{"ts": r["ts"], "data": json.loads(r["data"])} for r in rows]
+
+    def kompaksi_semua(self) -> int:
+        batas = time.time() - SIMPAN_HARI * 86400 if SIMPAN_HARI > 0 else None
+        return state_db.snapshot_pangkas(self.nama, SIMPAN_N, batas)
+
+
+if state_db is not None:
+    auto_log = SqliteSnapshotLog("auto")
+    manual_log = SqliteSnapshotLog("manual")
+else:
+    auto_log = SnapshotLog(CACHE_AUTO_DIR)
+    manual_log = SnapshotLog(CACHE_MANUAL_DIR)
+
+
+async def _job_kompaksi(_ctx=None):
+    for log in (auto_log, manual_log):
+        dibuang = await asyncio.to_thread(log.kompaksi_semua)
+        if dibuang:
+            logger.info("🧹 Kompaksi %s: %d snapshot lama dibuang", log.dir, dibuang)
+
+
+def jadwalkan_kompaksi(job_queue):
+    """Kompaksi berkala di background (retensi umur butuh ini meski tidak ada append)."""
+    job_queue.run_repeating(
+        _job_kompaksi,
+        interval=INTERVAL_KOMPAKSI,
+        first=300,
+        name="eps-snapshot-kompaksi",
+    )
@@ -0,0 +1,54 @@
+import logging
+import time
+from html import escape
+
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from utils.archive import cari_arsip, label_sumber
+from utils.topic_guard import handle_thread_guard
+
+logger = logging.getLogger(__name__)
+
+MAX_HASIL = 5
+
+
+async def cari(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/cari <kata> — cari di arsip pengumuman, jadwal & hasil EPS/kp2mi."""
+    if not await handle_thread_guard("cari", update, context):
+        return
+    teks = " ".join(context.args or []).strip()
+    if not teks:
+        await update.message.reply_text(
+            "🔎 Format: /cari <kata>\nContoh: /cari pemberangkatan desember"
+        )
+        return
+
+    try:
+        mulai = time.perf_counter()
+        hasil = await cari_arsip(teks, MAX_HASIL)
+        durasi = (time.perf_counter() - mulai) * 1000
+    except Exception:
+        logger.error("❌ Gagal cari arsip: %r", teks, exc_info=True)
+        await update.message.reply_text("❌ Terjadi kesalahan saat mencari arsip.")
+        return
+
+    logger.info("[/cari] %r → %d hasil (%.1f ms)", teks, len(hasil), durasi)
+    if not hasil:
+        await update.message.reply_text(
+            f"🔎 Tidak ada arsip yang cocok dengan <b>{escape(teks)}</b>.",
+            parse_mode="HTML",
+        )
+        return
+
+    baris = [f"🔎 <b>Hasil pencarian:</b> {escape(teks)}\n"]
+    for idx, row in enumerate(hasil, start=1):
+        item = f"<b>{idx}. {escape(row['judul'])}</b>\n🏷️ {escape(label_sumber(row['sumber']))}"
+        if row.get("tanggal"):
+            item += f" · 📅 {escape(row['tanggal'])}"
+        if row.get("link") and row["link"] != "-":
+            item += f'\n<a href="{escape(row["link"])}">🔗 Selengkapnya</a>'
+        baris.append(item + "\n")
+    await update.message.reply_text(
+        "\n".join(baris).strip(), parse_mode="HTML", disable_web_page_preview=True
+    )
@@ -0,0 +1,59 @@
+import logging
+from telegram import Update
+from telegram.ext import ContextTypes
+from utils.eps_pipeline import render
+from utils.eps_sources import EpsSource
+from utils.render_cache import render_cache
+from utils.prefetch import keterangan_umur, read_or_refresh
+from utils.topic_guard import handle_thread_guard
+
+logger = logging.getLogger(__name__)
+
+
+def make_eps_handler(source: EpsSource):
+    """Buat handler command untuk satu feed EPS di registry."""
+
+    async def handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if not await handle_thread_guard(source.guard_key, update, context):
+            return
+        try:
+            jumlah = 1
+            if context.args:
+                try:
+                    jumlah = int(context.args[0])
+                except ValueError:
+                    await update.message.reply_text(
+                        f"❗ Format salah. Contoh: /{source.command} 3"
+                    )
+                    return
+                if not (1 <= jumlah <= source.max_rows):
+                    await update.message.reply_text(
+                        f"❗ Masukkan angka antara 1–{source.max_rows}."
+                    )
+                    return
+
+            data = await read_or_refresh(source.key)
+            if not data:
+                await update.message.reply_text(
+                    f"⚠️ Tidak ada data {source.nama} ditemukan."
+                )
+                return
+
+            pesan = render_cache.get(
+                source.key, jumlah, "html", lambda: render(source, data, jumlah)
+            )
+            pesan += "\n\n" + keterangan_umur(source.key)
+            await update.message.reply_text(
+                pesan,
+                parse_mode="HTML",
+                disable_web_page_preview=True,
+            )
+
+        except Exception:
+            logger.error("❌ Gagal ambil data %s", source.nama, exc_info=True)
+            await update.message.reply_text(
+                f"❌ Terjadi kesalahan saat mengambil data {source.nama}."
+            )
+
+    handler.__name__ = f"get_{source.key}"
+    return handler
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import os
+
+from telegram.ext import Application
+
+from utils.constants import DATA_DIR, MONITOR_INFO, MONITOR_PRELIM
+from utils.eps_pipeline import render
+from utils.eps_sources import EPS_SOURCES
+from utils.monitor_utils import cari_item_baru, format_pesan, simpan_terkirim
+from utils.prefetch import add_listener
+from utils.topic_guard import get_thread_id
+
+logger = logging.getLogger(__name__)
+
+# Grup tujuan notifikasi; kosong = notifier nonaktif
+NOTIFY_CHAT_ID = os.getenv("NOTIFY_CHAT_ID", "").strip()
+JEDA_KIRIM = 0.5  # detik antar pesan, supaya tidak kena flood limit
+
+# === Sumber kp2mi: diff berdasarkan ID pengumuman ===
+KP2MI_SOURCES = {
+    "info": {"cache_file": MONITOR_INFO, "guard_key": "get_info", "tipe": "pengumuman"},
+    "prelim": {"cache_file": MONITOR_PRELIM, "guard_key": "get_prelim", "tipe": "prelim"},
+}
+
+
+def _cache_notif_eps(key: str) -> str:
+    return os.path.join(DATA_DIR, f"cache_notif_{key}.json")
+
+
+def _row_key(source):
+    return lambda item: "|".join(item.get(field, "") for field in source.fields)
+
+
+# === Susun pesan item baru per sumber ===
+def _item_baru(key: str, data: list):
+    """
+    Return (cache_file, key_fn, n, [(item, pesan), ...]) atau None kalau sumber
+    tidak dikenal. last_ids belum diperbarui; lihat simpan_terkirim.
+    """
+    if key in KP2MI_SOURCES:
+        cfg = KP2MI_SOURCES[key]
+        key_fn, n = (lambda item: item.get("id")), 10
+        baru = cari_item_baru(
+            data, cfg["cache_file"], key_fn, cfg["tipe"], n, simpan=False
+        )
+        return cfg["cache_file"], key_fn, n, [
+            (item, format_pesan(item, cfg["tipe"])) for item in baru
+        ]
+
+    source = EPS_SOURCES.get(key)
+    if source is None:
+        return None
+    cache_file, key_fn, n = _cache_notif_eps(key), _row_key(source), source.max_rows
+    baru = cari_item_baru(data, cache_file, key_fn, source.nama, n, simpan=False)
+    header = f"🔔 <b>Update {source.nama} EPS-TOPIK</b>\n\n"
+    return cache_file, key_fn, n, [
+        (item, header + render(source, [item], 1)) for item in baru
+    ]
+
+
+def _thread_tujuan(key: str):
+    if key in KP2MI_SOURCES:
+        guard_key = KP2MI_SOURCES[key]["guard_key"]
+    else:
+        guard_key = EPS_SOURCES[key].guard_key
+    # notif_<key> di topik_ids.json bisa mengarahkan notifikasi ke topik lain
+    return get_thread_id(f"notif_{key}", guard_key)
+
+
+def setup_notifier(app: Application):
+    """Pasang notifier di atas prefetch: satu poll per interval, hanya kirim item baru."""
+    if not NOTIFY_CHAT_ID:
+        logger.warning("NOTIFY_CHAT_ID belum diset, notifikasi item baru nonaktif.")
+        return
+
+    async def _on_refresh(key: str, data: list):
+        if key not in KP2MI_SOURCES and key not in EPS_SOURCES:
+            return
+        thread_id = _thread_tujuan(key)
+        if thread_id is None:
+            return  # sumber ini tidak dipetakan ke topik mana pun
+
+        hasil = await asyncio.to_thread(_item_baru, key, data)
+        if not hasil or not hasil[3]:
+            return
+        cache_file, key_fn, n, baru = hasil
+
+        # Tandai terkirim hanya setelah send_message sukses; kalau gagal di
+        # tengah (flood limit, jaringan), sisanya dicoba lagi di refresh berikutnya
+        terkirim = set()
+        try:
+            for item, pesan in baru:
+                await app.bot.send_message(
+                    chat_id=NOTIFY_CHAT_ID,
+                    message_thread_id=thread_id,
+                    text=pesan,
+                    parse_mode="HTML",
+                    disable_web_page_preview=True,
+                )
+                terkirim.add(key_fn(item))
+                await asyncio.sleep(JEDA_KIRIM)
+        finally:
+            simpan_terkirim(data, cache_file, key_fn, [item for item, _ in baru], terkirim, n)
+        logger.info("🔔 %d item baru %s dikirim ke topik %s", len(baru), key, thread_id)
+
+    add_listener(_on_refresh)
+    logger.info("🔔 Notifier item baru aktif untuk chat %s", NOTIFY_CHAT_ID)
@@ -1,172 +1,258 @@
-import requests
+import asyncio
 import logging
-from telegram import Update
+import re
+from uuid import uuid4
+
+from telegram import InlineQueryResultArticle, InputTextMessageContent, Update
 from telegram.ext import ContextTypes
+from utils.fx_history import ringkasan_tren
+from utils.fx_rates import FX_KEY, format_kurs, matrix_siap
+from utils.prefetch import keterangan_umur
 
 logger = logging.getLogger(__name__)
 
-
-def get_rate(base: str, target: str):
+DEFAULT_DARI = "krw"
+DEFAULT_KE = ["idr"]
+MAX_JUMLAH = 5  # nominal per request
+MAX_TUJUAN = 8  # mata uang tujuan per request
+MAX_TREN = 2  # pasangan yang ditampilkan trennya
+
+BENDERA = {
+    "krw": "🇰🇷",
+    "idr": "🇮🇩",
+    "usd": "🇺🇸",
+    "jpy": "🇯🇵",
+    "eur": "🇪🇺",
+    "sgd": "🇸🇬",
+    "myr": "🇲🇾",
+    "twd": "🇹🇼",
+    "hkd": "🇭🇰",
+    "sar": "🇸🇦",
+    "aud": "🇦🇺",
+    "cny": "🇨🇳",
+    "gbp": "🇬🇧",
+}
+# Akhiran nominal gaya Indonesia: 500rb, 2.5jt, 10k
+_AKHIRAN = {"k": 1e3, "rb": 1e3, "ribu": 1e3, "jt": 1e6, "juta": 1e6, "m": 1e6}
+_NOMINAL = re.compile(r"^(\d[\d.,_]*)(k|rb|ribu|jt|juta|m)?$", re.IGNORECASE)
+_RIBUAN = re.compile(r"^\d{1,3}([.,]\d{3})+$")
+_PEMISAH = {"ke", "to", "->", "→", "=", "dalam", "in"}
+
+
+# === Parsing argumen ===
+def parse_nominal(token: str):
+    """'2.500.000' / '2500000' / '2,5jt' / '500rb' → float; None kalau bukan angka."""
+    m = _NOMINAL.match(token.strip())
+    if not m:
+        return None
+    angka, akhiran = m.group(1).replace("_", ""), (m.group(2) or "").lower()
+    if _RIBUAN.match(angka):
+        angka = re.sub(r"[.,]", "", angka)
+    elif re.search(r",\d{3,}", angka):
+        return None  # "1000000,2500000" = daftar nominal, bukan desimal
+    else:
+        angka = angka.replace(",", ".")
     try:
-        logger.info(
-            f"[🔄 FETCH] Mengambil kurs dari {base.upper()} ke {target.upper()}"
-        )
-        url = f"https://www.floatrates.com/daily/{base.lower()}.json"
-        resp = requests.get(url, timeout=5)
-        data = resp.json()
-        rate = data[target.lower()]["rate"]
-        logger.info(f"[✅ RATE] 1 {base.upper()} = {rate:.4f} {target.upper()}")
-        return rate
-    except Exception as e:
-        logger.error(
-            f"[❌ ERROR] Gagal mengambil kurs {base.upper()} → {target.upper()}",
-            exc_info=True,
-        )
+        nilai = float(angka)
+    except ValueError:
         return None
-
-
-async def kurs_default(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    return nilai * _AKHIRAN.get(akhiran, 1)
+
+
+def parse_permintaan(args: list[str]):
+    """
+    Pola: [nominal ...] [dari] [ke] [ke2 ...]. Nominal boleh dipisah koma.
+    Kode setelah pemisah ("ke", "to", ...) tanpa kode sebelumnya = tujuan saja,
+    asal tetap DEFAULT_DARI ("/kurs 10 ke usd" = KRW → USD).
+    Return (jumlah, dari, ke) atau None kalau format tidak dikenali atau
+    asal sama dengan tujuan.
+    """
+    jumlah, kode = [], []
+    pisah = None  # jumlah kode sebelum pemisah pertama
+    for arg in args:
+        for token in filter(None, re.split(r"[;\s]+", arg)):
+            if token.lower() in _PEMISAH:
+                if pisah is None:
+                    pisah = len(kode)
+                continue
+            nilai = parse_nominal(token)
+            if nilai is not None and not kode:
+                jumlah.append(nilai)
+            elif re.fullmatch(r"[A-Za-z]{3}", token):
+                kode.append(token.lower())
+            elif "," in token and not kode:
+                # daftar nominal "1000000,2500000" (bukan format ribuan)
+                bagian = [parse_nominal(t) for t in token.split(",") if t]
+                if None in bagian:
+                    return None
+                jumlah.extend(bagian)
+            else:
+                return None
+
+    if pisah == 0 and kode:
+        # "/kurs 10 ke usd": semua kode = tujuan; "/kurs 10 ke krw" dari DEFAULT_KE
+        dari = DEFAULT_DARI if DEFAULT_DARI not in kode else DEFAULT_KE[0]
+        tujuan = kode
+    elif kode:
+        dari, tujuan = kode[0], kode[1:]
+    else:
+        dari, tujuan = DEFAULT_DARI, []
+    if not tujuan:
+        # "/kurs 100 idr": tujuan default, kecuali sama dengan asal
+        tujuan = [k for k in DEFAULT_KE if k != dari] or [DEFAULT_DARI]
+    ke = [k for k in dict.fromkeys(tujuan) if k != dari]
+    if not ke:
+        return None  # asal = tujuan, mis. "/kurs 100 idr ke idr"
+    return (jumlah or [1.0])[:MAX_JUMLAH], dari, ke[:MAX_TUJUAN]
+
+
+# === Format ===
+def _label(kode: str) -> str:
+    return f"{BENDERA.get(kode, '💱')} {kode.upper()}"
+
+
+def render_konversi(matrix, jumlah: list[float], dari: str, ke: list[str]) -> str:
+    hasil = matrix.konversi(jumlah, dari, ke)
+    bagian = ["*💱 KURS SEKARANG*"]
+    for nominal, baris in zip(jumlah, hasil):
+        teks = f"\n{_label(dari)} {format_kurs(nominal)} ="
+        for kode, nilai in zip(ke, baris):
+            teks += f"\n   {_label(kode)} {format_kurs(nilai)}"
+        bagian.append(teks)
+    if jumlah != [1.0]:
+        satuan = [f"1 {dari.upper()} = {format_kurs(matrix.rate(dari, k))} {k.upper()}" for k in ke]
+        bagian.append("\n📌 " + ", ".join(satuan))
+    return "\n".join(bagian)
+
+
+def teks_tren(dari: str, ke: list[str]) -> str:
+    """Tren min/maks/rata² & % perubahan 1/7/30 hari dari riwayat kurs (kalau ada)."""
+    bagian = []
+    for kode in ke[:MAX_TREN]:
+        tren = ringkasan_tren(dari, kode)
+        if not tren:
+            continue
+        teks = f"\n📊 *Tren {dari.upper()} → {kode.upper()}*"
+        for label, st in tren:
+            arah = "▲" if st["perubahan"] > 0 else "▼" if st["perubahan"] < 0 else "■"
+            teks += (
+                f"\n• {label}: {arah}{abs(st['perubahan']):.2f}% "
+                f"(min {format_kurs(st['min'])} · maks {format_kurs(st['max'])} · rata² {format_kurs(st['avg'])})"
+            )
+        bagian.append(teks)
+    return "\n".join(bagian)
+
+
+def _kode_asing(matrix, dari: str, ke: list[str]) -> list[str]:
+    return [k.upper() for k in [dari, *ke] if k not in matrix]
+
+
+# === Command ===
+async def kurs(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    """/kurs [nominal ...] [dari] [ke ...] — contoh: /kurs 2jt krw idr usd jpy"""
     user = update.effective_user
-    logger.info(
-        f"[📥 /kurs] {user.full_name} ({user.id}) meminta kurs default KRW → IDR"
-    )
-
-    waiting_msg = await update.message.reply_text("🔄 Mohon tunggu, mengambil kurs...")
-
-    rate = get_rate("krw", "idr")
-    if rate:
-        await waiting_msg.delete()
-        logger.info(f"[✅ RESP] Berhasil mengirim kurs ke {user.id}")
+    permintaan = parse_permintaan(ctx.args or [])
+    if permintaan is None:
         await update.message.reply_text(
-            f"*💱 KURS SEKARANG*\n\n🇰🇷 1 KRW = 🇮🇩 {rate:,.2f} IDR",
-            parse_mode="Markdown",
+            "Gunakan: /kurs <jumlah> <dari> <ke> [ke2 ...]\n"
+            "Contoh: /kurs 2500000 krw idr usd jpy\n"
+            "Beberapa nominal: /kurs 1jt,2.5jt krw idr\n"
+            "Asal & tujuan harus berbeda."
         )
-    else:
-        await waiting_msg.edit_text("❌ Gagal mengambil kurs.")
-
-
-async def kurs_idr(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-    user = update.effective_user
-    text = update.message.text
-    args = text.split()
-
-    if len(args) < 2 or not args[1].isdigit():
-        await update.message.reply_text("Gunakan: /kursidr <nominal_KRW>")
         return
+    logger.info(f"[📥 /kurs] {user.full_name} ({user.id}) {permintaan}")
+    await _balas(update, *permintaan)
 
-    amt = float(args[1])
-    logger.info(
-        f"[📥 /kursidr] {user.full_name} ({user.id}) meminta konversi {amt} KRW → IDR"
-    )
 
-    waiting_msg = await update.message.reply_text("🔄 Mohon tunggu, menghitung...")
+async def _balas(update: Update, jumlah: list[float], dari: str, ke: list[str]):
+    try:
+        matrix = await matrix_siap()
+    except Exception:
+        logger.error("[❌ ERROR] Gagal menyiapkan matriks kurs", exc_info=True)
+        matrix = None
+    if matrix is None:
+        await update.message.reply_text("❌ Gagal mengambil kurs.")
+        return
 
-    rate = get_rate("krw", "idr")
-    if rate:
-        hasil = amt * rate
-        await waiting_msg.delete()
-        logger.info(f"[✅ RESP] {amt:.0f} KRW = {hasil:,.2f} IDR dikirim ke {user.id}")
+    asing = _kode_asing(matrix, dari, ke)
+    if asing:
         await update.message.reply_text(
-            f"*💱 KURS SEKARANG*\n\n🇰🇷 {amt:.0f} KRW = 🇮🇩 {hasil:,.2f} IDR",
-            parse_mode="Markdown",
+            f"❌ Mata uang tidak dikenal: {', '.join(asing)}"
         )
-    else:
-        await waiting_msg.edit_text("❌ Gagal mengambil kurs.")
-
-
-async def kurs_won(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-    user = update.effective_user
-    text = update.message.text
-    args = text.split()
-
-    if len(args) < 2 or not args[1].isdigit():
-        await update.message.reply_text("Gunakan: /kurswon <nominal_IDR>")
         return
 
-    amt = float(args[1])
-    logger.info(
-        f"[📥 /kurswon] {user.full_name} ({user.id}) meminta konversi {amt} IDR → KRW"
+    pesan = render_konversi(matrix, jumlah, dari, ke)
+    tren = await asyncio.to_thread(teks_tren, dari, ke)
+    if tren:
+        pesan += "\n" + tren
+    await update.message.reply_text(
+        pesan + f"\n\n{keterangan_umur(FX_KEY)}",
+        parse_mode="Markdown",
     )
 
-    waiting_msg = await update.message.reply_text("🔄 Mohon tunggu, menghitung...")
 
-    rate = get_rate("idr", "krw")
-    if rate:
-        hasil = amt * rate
-        await waiting_msg.delete()
-        logger.info(f"[✅ RESP] {amt:.0f} IDR = {hasil:,.2f} KRW dikirim ke {user.id}")
-        await update.message.reply_text(
-            f"*💱 KURS SEKARANG*\n\n🇮🇩 {amt:.0f} IDR = 🇰🇷 {hasil:,.2f} KRW",
-            parse_mode="Markdown",
-        )
-    else:
-        await waiting_msg.edit_text("❌ Gagal mengambil kurs.")
+def make_alias(dari: str, ke: str, wajib_nominal: bool):
+    """Command lama (/kursidr, /kurswon, ...) = /kurs dengan pasangan tetap."""
 
-
-# ===== USD =====
-async def kurs_usd(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-    user = update.effective_user
-    text = update.message.text
-    args = text.split()
-
-    amt = 1.0
-    if len(args) >= 2:
-        try:
-            amt = float(args[1])
-        except ValueError:
-            await update.message.reply_text("Gunakan: /kursusd atau /kursusd <nominal_USD>")
+    async def handler(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
+        args = ctx.args or []
+        jumlah = [parse_nominal(a) for a in args[:MAX_JUMLAH]]
+        if (wajib_nominal and not args) or None in jumlah:
+            perintah = (update.message.text or "").split()[0]
+            await update.message.reply_text(
+                f"Gunakan: {perintah} <nominal_{dari.upper()}>"
+            )
             return
+        await _balas(update, jumlah or [1.0], dari, [ke])
 
-    logger.info(
-        f"[📥 /kursusd] {user.full_name} ({user.id}) meminta konversi {amt} USD → IDR"
-    )
+    handler.__name__ = f"kurs_{dari}_{ke}"
+    return handler
 
-    waiting_msg = await update.message.reply_text("🔄 Mohon tunggu, menghitung...")
-
-    rate = get_rate("usd", "idr")
-    if rate:
-        hasil = amt * rate
-        await waiting_msg.delete()
-        logger.info(f"[✅ RESP] {amt:.2f} USD = {hasil:,.2f} IDR dikirim ke {user.id}")
-        await update.message.reply_text(
-            f"*💱 KURS USD → IDR*\n\n🇺🇸 {amt:.2f} USD = 🇮🇩 {hasil:,.2f} IDR\n\n"
-            f"📌 1 USD = {rate:,.2f} IDR",
-            parse_mode="Markdown",
-        )
-    else:
-        await waiting_msg.edit_text("❌ Gagal mengambil kurs USD.")
 
+kurs_default = kurs
+kurs_idr = make_alias("krw", "idr", wajib_nominal=True)
+kurs_won = make_alias("idr", "krw", wajib_nominal=True)
+kurs_usd = make_alias("usd", "idr", wajib_nominal=False)
+kurs_idr_usd = make_alias("idr", "usd", wajib_nominal=True)
 
-async def kurs_idr_usd(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-    user = update.effective_user
-    text = update.message.text
-    args = text.split()
 
-    if len(args) < 2:
-        await update.message.reply_text("Gunakan: /kursidrusd <nominal_IDR>")
+# === Inline mode: @bot 2jt krw idr usd ===
+async def kurs_inline(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    query = update.inline_query
+    permintaan = parse_permintaan((query.query or "").split())
+    if permintaan is None:
+        await query.answer([], cache_time=5)
         return
+    jumlah, dari, ke = permintaan
 
-    try:
-        amt = float(args[1])
-    except ValueError:
-        await update.message.reply_text("Gunakan: /kursidrusd <nominal_IDR>")
+    matrix = await matrix_siap()
+    if matrix is None or _kode_asing(matrix, dari, ke):
+        await query.answer([], cache_time=5)
         return
 
-    logger.info(
-        f"[📥 /kursidrusd] {user.full_name} ({user.id}) meminta konversi {amt} IDR → USD"
-    )
-
-    waiting_msg = await update.message.reply_text("🔄 Mohon tunggu, menghitung...")
-
-    rate = get_rate("idr", "usd")
-    if rate:
-        hasil = amt * rate
-        await waiting_msg.delete()
-        logger.info(f"[✅ RESP] {amt:.0f} IDR = {hasil:,.2f} USD dikirim ke {user.id}")
-        await update.message.reply_text(
-            f"*💱 KURS IDR → USD*\n\n🇮🇩 {amt:.0f} IDR = 🇺🇸 {hasil:,.2f} USD\n\n"
-            f"📌 1 IDR = {rate:,.4f} USD",
-            parse_mode="Markdown",
+    nilai = matrix.konversi(jumlah[:1], dari, ke)[0]
+    hasil = [
+        InlineQueryResultArticle(
+            id=str(uuid4()),
+            title=f"{format_kurs(jumlah[0])} {dari.upper()} = {format_kurs(v)} {k.upper()}",
+            description=keterangan_umur(FX_KEY),
+            input_message_content=InputTextMessageContent(
+                render_konversi(matrix, jumlah, dari, [k]), parse_mode="Markdown"
+            ),
         )
-    else:
-        await waiting_msg.edit_text("❌ Gagal mengambil kurs USD.")
+        for k, v in zip(ke, nilai)
+    ]
+    if len(ke) > 1:
+        hasil.insert(
+            0,
+            InlineQueryResultArticle(
+                id=str(uuid4()),
+                title=f"{format_kurs(jumlah[0])} {dari.upper()} → "
+                + ", ".join(k.upper() for k in ke),
+                description="Semua mata uang sekaligus",
+                input_message_content=InputTextMessageContent(
+                    render_konversi(matrix, jumlah, dari, ke), parse_mode="Markdown"
+                ),
+            ),
+        )
+    await query.answer(hasil, cache_time=60)
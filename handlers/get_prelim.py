@@ -1,12 +1,13 @@
 import logging
-import os
-import json
-import requests
-from bs4 import BeautifulSoup
-from html import unescape
+import time
 from telegram import Update
 from telegram.ext import ContextTypes
+from utils.announcement_store import AnnouncementStore
 from utils.constants import PRELIM_FILE
+from utils.circuit_breaker import CircuitOpenError
+from utils.http_client import fetch_json
+from utils.render_cache import render_cache
+from utils.prefetch import keterangan_umur, read_or_refresh, register_source
 from utils.topic_guard import handle_thread_guard
 
 logger = logging.getLogger(__name__)
@@ -14,60 +15,53 @@ logger = logging.getLogger(__name__)
 API_URL = "https://www.kp2mi.go.id/gtog-data/korea/Preliminary%20Training%20dan%20Info?start=0&length=10"
 CACHE_FILE = PRELIM_FILE
 
+# === Cache (per ID, judul di-parse sekali) ===
+prelim_store = AnnouncementStore(CACHE_FILE, "preliminary")
 
-# === Parser judul & link ===
-def parse_judul_link(html_string):
-    if not html_string or not isinstance(html_string, str):
-        return "Judul tidak ditemukan", "-"
-    raw_html = unescape(str(html_string))
-    soup = BeautifulSoup(raw_html, "html.parser")
-    a = soup.find("a")
-    if not a or not a.get("href"):
-
-        return "Judul tidak ditemukan", "-"
-    teks = a.get_text(strip=True)
-    href = a.get("href", "").replace("\\/", "/").strip()
-    if href.startswith("/"):
-        href = f"https://www.kp2mi.go.id{href}"
-    return teks, href
-
-
-# === Cache ===
-def load_cache_prelim():
-    if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return []
-
-
-def save_cache_prelim(api_data):
-    cleaned = []
-    for item in api_data:
-        html_judul = item.get("judul", "")
-        judul, link = parse_judul_link(html_judul)
-
-        if judul == "Judul tidak ditemukan" or link == "-":
-
-            continue
-
-        cleaned.append(
-            {
-                "id": item.get("id"),
-                "judul": judul,
-                "link": link,
-                "creator": item.get("creator", "-"),
-                "is_active": item.get("is_active", 1),
-                "created_at": item.get("created_at", "-"),
-                "updated_at": item.get("updated_at", "-"),
-                "view": item.get("view", 0),
-                "kategori": item.get("kategori", "-"),
-                "tanggal": item.get("tanggal", "-"),
-            }
+
+async def refresh_prelim():
+    try:
+        response = await fetch_json(API_URL)
+        api_data = response.get("data", [])
+    except CircuitOpenError as e:
+        logger.info("⚡ Fetch preliminary dilewati: %s", e)
+        api_data = []
+    except Exception:
+        logger.exception("Gagal fetch pengumuman preliminary dari API")
+        api_data = []
+
+    if not api_data:
+        logger.warning("API pengumuman preliminary tidak mengembalikan data, pakai cache.")
+        return prelim_store.items(), prelim_store.mtime(), False
+
+    # Judul hanya di-parse untuk ID baru; item lama cukup sinkron view dkk
+    await prelim_store.merge_async(api_data)
+    return prelim_store.items(), time.time(), True
+
+
+register_source("prelim", refresh_prelim, fresh_ttl=600, stale_ttl=2 * 3600)
+
+
+# === Render ===
+def render_prelim(data: list, jumlah: int) -> str:
+    pesan = ""
+    for idx, item in enumerate(data, start=1):
+        judul = item.get("judul", "-")
+        link = item.get("link", "-")
+        pesan += (
+            f"*{idx}. 📢 {judul}*\n\n"
+            f"🆔 ID: `{item.get('id', '-')}`\n"
+            f"✍️ Creator: `{item.get('creator', '-')}`\n"
+            f"📅 Tanggal: `{item.get('tanggal', '-')}`\n"
+            f"👁️ View: `{item.get('view', '-')}`\n"
+            f"🏷️ Kategori: `{item.get('kategori', '-')}`\n"
         )
+        if link and link != "-":
+            pesan += f"🔗 [Klik untuk lihat pengumuman]({link})\n"
 
-    if cleaned:
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(cleaned, f, ensure_ascii=False, indent=2)
+        if idx < len(data):
+            pesan += "\n==========================\n\n"
+    return pesan.strip()
 
 
 # === Handler ===
@@ -86,63 +80,18 @@ async def get_prelim(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 await update.message.reply_text("Format salah. Contoh: /training 3")
                 return
 
-        response = requests.get(API_URL)
-        api_data = response.json().get("data", [])
-
-        if not api_data:
-            logger.warning("API Preliminary tidak mengembalikan data.")
+        data = (await read_or_refresh("prelim"))[:jumlah]
+        if not data:
             await update.message.reply_text(
                 "⚠️ Tidak ada pengumuman preliminary training."
             )
             return
 
-        cache_data = load_cache_prelim()
-        id_terakhir_cache = cache_data[0]["id"] if cache_data else None
-        id_terbaru_api = api_data[0].get("id", None)
-
-        if id_terakhir_cache != id_terbaru_api:
-            logger.info("📥 Ditemukan pengumuman preliminary baru, update cache.")
-            save_cache_prelim(api_data)
-            data = load_cache_prelim()[:jumlah]
-        else:
-            logger.info("🟡 Tidak ada pengumuman baru — gunakan cache (update view)")
-            # Selalu update cache berdasarkan isi API terbaru (judul/link mungkin sama, view bisa beda)
-            save_cache_prelim(api_data)
-            logger.info(
-                "ℹ️ Cache diperbarui untuk menyinkronkan view atau data lainnya."
-            )
-
-            # Sinkronisasi view dari API
-            updated_cache = []
-            for i, cached_item in enumerate(cache_data):
-                if i < len(api_data):
-                    cached_item["view"] = api_data[i].get(
-                        "view", cached_item.get("view")
-                    )
-                updated_cache.append(cached_item)
-
-            save_cache_prelim(updated_cache)
-            data = updated_cache[:jumlah]
-
-        pesan = ""
-        for idx, item in enumerate(data, start=1):
-            judul = item.get("judul", "-")
-            link = item.get("link", "-")
-            pesan += (
-                f"*{idx}. 📢 {judul}*\n\n"
-                f"🆔 ID: `{item.get('id', '-')}`\n"
-                f"✍️ Creator: `{item.get('creator', '-')}`\n"
-                f"📅 Tanggal: `{item.get('tanggal', '-')}`\n"
-                f"👁️ View: `{item.get('view', '-')}`\n"
-                f"🏷️ Kategori: `{item.get('kategori', '-')}`\n"
-            )
-            if link and link != "-":
-                pesan += f"🔗 [Klik untuk lihat pengumuman]({link})\n"
-
-            if jumlah > 1 and idx < jumlah:
-                pesan += "\n==========================\n\n"
-
-        await update.message.reply_text(pesan.strip(), parse_mode="Markdown")
+        pesan = render_cache.get(
+            "prelim", jumlah, "markdown", lambda: render_prelim(data, jumlah)
+        )
+        pesan += "\n\n" + keterangan_umur("prelim")
+        await update.message.reply_text(pesan, parse_mode="Markdown")
 
     except Exception as e:
         logger.error("❌ Gagal ambil data preliminary training", exc_info=True)
@@ -15,9 +15,11 @@ Semua perintah gabungan tiga bot di grup ini:
 /pass2 – Hasil Tahap Final (lolos ke Korea)  
 /get – Pengumuman terbaru G to G  
 /prelim – Info tahap prelim  
-/kurs – Kurs 1 KRW → IDR  
+/cari <kata> – Cari arsip pengumuman & jadwal lama  
+/kurs [jumlah] [dari] [ke ...] – Konversi kurs, mis. /kurs 2jt krw idr usd  
 /kursidr [n] – KRW → IDR, /kurswon  – IDR → KRW  
 /kursusd [n] – USD → IDR, /kursidrusd – IDR → USD  
+/kursalert <dari/ke> <above|below> <nilai> – Alert kurs via DM  
 /adminlist – Daftar admin grup, /cekstrike – Cek strike kamu
 /autoreply_on | /autoreply_off – Aktif/nonaktif autoreply per grup  
 /autoreply_reload – Reload config autoreply (DM admin saja)
@@ -35,7 +37,7 @@ Semua perintah gabungan tiga bot di grup ini:
 👑 Admin: /add, /update, /delete, dll
 
 ⚠️ Admin Grup: /mute, /unmute, /ban, /unban, /restrike  
-🛡️ Owner: /resetstrikeall, /resetbanall
+🛡️ Owner: /resetstrikeall, /resetbanall, /fetchstats
 
 📎 *Lainnya*  
 /help – Tampilkan bantuan ini  
@@ -0,0 +1,113 @@
+import logging
+
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from handlers.get_kurs import parse_nominal
+from utils.fx_alerts import ATAS, BAWAH, MAX_ALERT_PER_USER, alert_book
+from utils.fx_rates import format_kurs, matrix_siap
+
+logger = logging.getLogger(__name__)
+
+_ARAH = {
+    "above": ATAS,
+    "atas": ATAS,
+    ">": ATAS,
+    ">=": ATAS,
+    "below": BAWAH,
+    "bawah": BAWAH,
+    "<": BAWAH,
+    "<=": BAWAH,
+}
+
+FORMAT = (
+    "🔔 Format:\n"
+    "/kursalert <dari/ke> <above|below> <nilai>\n"
+    "Contoh: /kursalert krw/idr above 12.5\n"
+    "/kursalert – lihat alert kamu\n"
+    "/kursalert hapus <id> – hapus alert"
+)
+
+
+def _daftar(user_id: int) -> str:
+    alerts = alert_book.milik(user_id)
+    if not alerts:
+        return "🔕 Kamu belum punya alert kurs.\n\n" + FORMAT
+    baris = [f"🔔 *Alert kurs kamu* ({len(alerts)}/{MAX_ALERT_PER_USER})"]
+    for a in alerts:
+        tanda = "≥" if a["arah"] == ATAS else "≤"
+        baris.append(
+            f"#{a['id']} · 1 {a['dari'].upper()} {tanda} {format_kurs(a['nilai'])} {a['ke'].upper()}"
+        )
+    return "\n".join(baris)
+
+
+async def kurs_alert(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    """/kursalert <dari/ke> <above|below> <nilai> — notifikasi DM saat kurs lewat batas."""
+    user = update.effective_user
+    args = ctx.args or []
+
+    if not args:
+        await update.message.reply_text(_daftar(user.id), parse_mode="Markdown")
+        return
+
+    if args[0].lower() in ("hapus", "del", "delete") and len(args) == 2:
+        try:
+            alert_id = int(args[1].lstrip("#"))
+        except ValueError:
+            await update.message.reply_text(FORMAT)
+            return
+        if alert_book.hapus(user.id, alert_id):
+            await update.message.reply_text(f"🗑️ Alert #{alert_id} dihapus.")
+        else:
+            await update.message.reply_text(f"❌ Alert #{alert_id} tidak ditemukan.")
+        return
+
+    if len(args) != 3 or "/" not in args[0] or args[1].lower() not in _ARAH:
+        await update.message.reply_text(FORMAT)
+        return
+    dari, _, ke = args[0].lower().partition("/")
+    arah = _ARAH[args[1].lower()]
+    nilai = parse_nominal(args[2])
+    if not nilai:
+        await update.message.reply_text(FORMAT)
+        return
+
+    if dari == ke:
+        await update.message.reply_text("❌ Mata uang asal & tujuan harus berbeda.")
+        return
+
+    matrix = await matrix_siap()
+    if matrix is None:
+        await update.message.reply_text("❌ Gagal mengambil kurs.")
+        return
+    asing = [k.upper() for k in (dari, ke) if k not in matrix]
+    if asing:
+        await update.message.reply_text(f"❌ Mata uang tidak dikenal: {', '.join(asing)}")
+        return
+
+    # Alert yang sudah terpenuhi sekarang langsung terpicu di refresh berikutnya: tolak
+    rate = matrix.rate(dari, ke)
+    if (arah == ATAS and rate >= nilai) or (arah == BAWAH and rate <= nilai):
+        await update.message.reply_text(
+            f"ℹ️ Kurs sekarang 1 {dari.upper()} = {format_kurs(rate)} {ke.upper()}, "
+            "target itu sudah tercapai."
+        )
+        return
+
+    try:
+        alert = alert_book.tambah(user.id, dari, ke, arah, nilai)
+    except ValueError as e:
+        await update.message.reply_text(f"❌ {e}")
+        return
+
+    logger.info(f"[🔔 /kursalert] {user.full_name} ({user.id}) {alert}")
+    tanda = "≥" if arah == ATAS else "≤"
+    pesan = (
+        f"✅ Alert #{alert['id']} dipasang: 1 {dari.upper()} {tanda} "
+        f"{format_kurs(nilai)} {ke.upper()}\n"
+        f"Sekarang: {format_kurs(rate)} {ke.upper()}"
+    )
+    if update.effective_chat.type != "private":
+        pesan += "\n📩 Notifikasi dikirim lewat DM, pastikan sudah /start bot."
+    await update.message.reply_text(pesan)
@@ -1,16 +1,16 @@
 import re
 import os
 import time
-import json
-import random
 import logging
 from collections import defaultdict
 from telegram import Update, ChatPermissions, User
 from telegram.ext import ContextTypes
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
-from utils.constants import MODERATION_FILE, BANNED_FILE, RESPON_FILE, STRIKE_LOG
+from utils.constants import MODERATION_FILE, BANNED_FILE, STRIKE_LOG
 from utils.anti_phishing import handle_phishing
+from utils.json_store import baca_json, json_store
+from utils.state_db import state_db
 
 
 # Waktu reset per strike
@@ -37,13 +37,12 @@ logging.basicConfig(
 
 def load_keywords():
     try:
-        with open(MODERATION_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return (
-                data.get("BAN_KEYWORDS", []),
-                data.get("BAD_WORDS", []),
-                data.get("SENSITIF", []),
-            )
+        data = baca_json(MODERATION_FILE)
+        return (
+            data.get("BAN_KEYWORDS", []),
+            data.get("BAD_WORDS", []),
+            data.get("SENSITIF", []),
+        )
     except Exception as e:
         logging.warning(f"Gagal memuat moderation_keywords.json: {e}")
         return [], [], []
@@ -51,13 +50,12 @@ def load_keywords():
 
 def save_keywords(ban, bad, sensitif):
     try:
-        with open(MODERATION_FILE, "w", encoding="utf-8") as f:
-            json.dump(
-                {"BAN_KEYWORDS": ban, "BAD_WORDS": bad, "SENSITIF": sensitif},
-                f,
-                indent=2,
-                ensure_ascii=False,
-            )
+        json_store.jadwalkan(
+            MODERATION_FILE,
+            {"BAN_KEYWORDS": ban, "BAD_WORDS": bad, "SENSITIF": sensitif},
+            indent=2,
+            ensure_ascii=False,
+        )
     except Exception as e:
         logging.warning(f"Gagal menyimpan keyword ke JSON: {e}")
 
@@ -103,24 +101,37 @@ BAN_KEYWORDS, BAD_WORDS, SENSITIF = load_keywords()
 user_strikes = defaultdict(int)
 last_global_command = 0
 
-# === Load respon.json ===
-try:
-    with open(RESPON_FILE, "r", encoding="utf-8") as f:
-        RESPON_DATA = json.load(f)
-except:
-    RESPON_DATA = []
+# Backend SQLite: strike bertahan lintas restart (backend JSON: memori saja)
+if state_db is not None:
+    for _uid, _ts in state_db.muat_strike().items():
+        user_strike_timestamps[_uid] = _ts
+        user_strikes[_uid] = len(_ts)
+
+
+def simpan_strike(user_id: int):
+    if state_db is not None:
+        state_db.simpan_strike(user_id, user_strike_timestamps.get(user_id, []))
 
 # === Banned User Storage ===
-try:
-    with open(BANNED_FILE, "r") as f:
-        BANNED_USERS = set(json.load(f))
-except:
-    BANNED_USERS = set()
+BANNED_USERS = set(baca_json(BANNED_FILE, []))
 
 
 def save_banned():
-    with open(BANNED_FILE, "w") as f:
-        json.dump(list(BANNED_USERS), f)
+    json_store.jadwalkan(BANNED_FILE, list(BANNED_USERS))
+
+
+async def simpan_ban(user_id: int, dibanned: bool):
+    """Ubah satu user di daftar ban (baca-ubah-tulis), tanpa menimpa ban dari anti_phishing."""
+
+    def ubah(data):
+        data = set(data or [])
+        if dibanned:
+            data.add(user_id)
+        else:
+            data.discard(user_id)
+        return list(data)
+
+    await json_store.perbarui(BANNED_FILE, ubah, default=[])
 
 
 def is_admin(user_id: int) -> bool:
@@ -204,7 +215,7 @@ async def mute_user(chat_id, user_id, ctx, duration=MUTE_DURATION):
 async def ban_user(chat_id, user_id, ctx):
     await ctx.bot.ban_chat_member(chat_id, user_id)
     BANNED_USERS.add(user_id)
-    save_banned()
+    await simpan_ban(user_id, True)
     logging.warning(f"🚫 Ban {user_id} dari {chat_id}")
 
 
@@ -305,7 +316,7 @@ async def cmd_unban(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
 
     await ctx.bot.unban_chat_member(update.effective_chat.id, target.id)
     BANNED_USERS.discard(target.id)
-    save_banned()
+    await simpan_ban(target.id, False)
     await update.message.reply_text(
         f"✅ {target.mention_html()} telah di-unban.", parse_mode="HTML"
     )
@@ -329,6 +340,8 @@ async def cmd_restrike(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
         )
 
     user_strikes[target.id] = 0
+    user_strike_timestamps.pop(target.id, None)
+    simpan_strike(target.id)
     await update.message.reply_text(
         f"✅ Strike {target.mention_html()} telah direset.", parse_mode="HTML"
     )
@@ -372,6 +385,8 @@ async def cmd_resetstrikeall(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
 
     user_strikes.clear()
     user_strike_timestamps.clear()
+    if state_db is not None:
+        state_db.hapus_semua_strike()
 
     with open(STRIKE_LOG, "a") as f:
         f.write(f"{datetime.utcnow().isoformat()} - Semua strike direset oleh OWNER\n")
@@ -443,6 +458,8 @@ async def moderasi(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
                 continue
         user_strike_timestamps[user_id] = retained
         user_strikes[user_id] = len(retained)
+        if len(retained) != len(timestamps):
+            simpan_strike(user_id)
 
     # Deteksi kata kasar, topik sensitif, link
     clean = clean_text(text)
@@ -461,6 +478,7 @@ async def moderasi(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
         user_strikes[user_id] += 1
         strikes = user_strikes[user_id]
         user_strike_timestamps[user_id].append(now.isoformat())
+        simpan_strike(user_id)
 
         with open(STRIKE_LOG, "a") as f:
             f.write(
@@ -492,7 +510,3 @@ async def moderasi(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
             parse_mode="HTML",
         )
         return
-
-    # Balasan ke bot → random response
-    if msg.reply_to_message and msg.reply_to_message.from_user.is_bot and RESPON_DATA:
-        await msg.reply_text(random.choice(RESPON_DATA))
@@ -1,21 +1,30 @@
 # register_handlers.py
-from telegram.ext import Application, CommandHandler, MessageHandler, filters
+from telegram.ext import (
+    Application,
+    CommandHandler,
+    InlineQueryHandler,
+    MessageHandler,
+    filters,
+)
 
 from handlers.command_wrapper import with_cooldown
 from handlers.get_info import get_info
 from handlers.get_prelim import get_prelim
 from handlers.responder import simple_responder
 from handlers.get_link import link_command
-from handlers.get_kurs import kurs_default, kurs_idr, kurs_won
+from handlers.get_kurs import kurs_default, kurs_idr, kurs_won, kurs_inline
 from handlers.get_kurs import kurs_usd, kurs_idr_usd
 from handlers.rules import show_rules
 from handlers.welcome import welcome_new_member
-from handlers.get_reg import get_reg
-from handlers.get_jadwal import get_jadwal
-from handlers.get_pass1 import get_pass1
-from handlers.get_pass2 import get_pass2
 from handlers.cek_id import cek_id
+from handlers.eps_feed import make_eps_handler
+from utils.eps_sources import EPS_SOURCES
 from handlers.help import help_command
+from handlers.stats import fetch_stats
+from handlers.eps_notifier import setup_notifier
+from handlers.cari import cari
+from handlers.cache_utils import jadwalkan_kompaksi
+from handlers.kurs_alert import kurs_alert
 from handlers.thread_guard import auto_delete_non_admin_in_threads
 from handlers.moderasi import (
     lihat_admin,
@@ -30,6 +39,11 @@ from handlers.moderasi import (
     cmd_resetbanall,
     cmd_tambahkata,
 )
+from utils.response_store import response_store, INTERVAL_CEK_RESPON
+from utils.prefetch import start_prefetch
+from utils.archive import setup_archive
+from utils.fx_history import setup_fx_history
+from utils.fx_alerts import setup_fx_alerts
 from handlers.auto_reply import (
     handle_autoreply_message,
     handle_autoreply_off,
@@ -55,16 +69,21 @@ def register_handlers(app: Application):
     app.add_handler(CommandHandler("cekid", with_cooldown(cek_id)))
     app.add_handler(CommandHandler("get", with_cooldown(get_info)))
     app.add_handler(CommandHandler("prelim", with_cooldown(get_prelim)))
-    app.add_handler(CommandHandler("reg", with_cooldown(get_reg)))
-    app.add_handler(CommandHandler("jadwal", with_cooldown(get_jadwal)))
-    app.add_handler(CommandHandler("pass1", with_cooldown(get_pass1)))
-    app.add_handler(CommandHandler("pass2", with_cooldown(get_pass2)))
+    # Feed EPS (jadwal, reg, pass1, pass2) dari registry utils/eps_sources.py
+    for source in EPS_SOURCES.values():
+        app.add_handler(
+            CommandHandler(source.command, with_cooldown(make_eps_handler(source)))
+        )
+    app.add_handler(CommandHandler("cari", with_cooldown(cari)))
     app.add_handler(CommandHandler("link", with_cooldown(link_command)))
     app.add_handler(CommandHandler("kurs", with_cooldown(kurs_default)))
     app.add_handler(CommandHandler("kursidr", with_cooldown(kurs_idr)))
     app.add_handler(CommandHandler("kurswon", with_cooldown(kurs_won)))
     app.add_handler(CommandHandler("kursusd", with_cooldown(kurs_usd)))
     app.add_handler(CommandHandler("kursidrusd", with_cooldown(kurs_idr_usd)))
+    app.add_handler(CommandHandler("kursalert", with_cooldown(kurs_alert)))
+    # Inline mode: "@bot 2jt krw idr usd" (aktifkan /setinline di BotFather)
+    app.add_handler(InlineQueryHandler(kurs_inline))
     app.add_handler(CommandHandler("rules", with_cooldown(show_rules)))
     app.add_handler(CommandHandler("ban", with_cooldown(cmd_ban)))
     app.add_handler(CommandHandler("unban", with_cooldown(cmd_unban)))
@@ -76,6 +95,7 @@ def register_handlers(app: Application):
     app.add_handler(CommandHandler("cekstrike", cmd_cekstrike))
     app.add_handler(CommandHandler("resetstrikeall", cmd_resetstrikeall))
     app.add_handler(CommandHandler("resetbanall", cmd_resetbanall))
+    app.add_handler(CommandHandler("fetchstats", fetch_stats))
     app.add_handler(CommandHandler("autoreply_on", handle_autoreply_on))
     app.add_handler(CommandHandler("autoreply_off", handle_autoreply_off))
     app.add_handler(CommandHandler("autoreply_reload", handle_autoreply_reload))
@@ -111,3 +131,24 @@ def register_handlers(app: Application):
         ),
         group=3,
     )
+
+    # === Background jobs ===
+    # Reload respon.json otomatis kalau file diedit (tanpa restart)
+    app.job_queue.run_repeating(
+        response_store.cek_perubahan,
+        interval=INTERVAL_CEK_RESPON,
+        first=INTERVAL_CEK_RESPON,
+        name="respon-reload",
+    )
+    # Prefetch data EPS/kp2mi ke memori, command cukup baca snapshot
+    start_prefetch(app.job_queue)
+    # Push item baru (kp2mi & hrdkorea) ke topik, menumpang hasil prefetch
+    setup_notifier(app)
+    # Semua item yang pernah di-scrape masuk arsip SQLite untuk /cari
+    setup_archive()
+    # Riwayat kurs per pasangan untuk tren /kurs
+    setup_fx_history()
+    # Alert threshold kurs (/kursalert), dicek tiap refresh & dikirim via DM
+    setup_fx_alerts(app)
+    # Retensi riwayat snapshot akun EPS (handlers/cache_utils.py)
+    jadwalkan_kompaksi(app.job_queue)
@@ -0,0 +1,58 @@
+import os
+import logging
+from telegram import Update
+from telegram.ext import ContextTypes
+from dotenv import load_dotenv
+from utils.circuit_breaker import get_breaker_stats
+from utils.fx_providers import get_provider_stats
+from utils.http_client import get_fetch_stats
+from utils.render_cache import render_cache
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+OWNER_ID = int(os.getenv("MY_TELEGRAM_ID", "0"))
+
+
+async def fetch_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Statistik fetch EPS (conditional request & parse yang dihindari). Owner saja."""
+    if update.effective_user.id != OWNER_ID:
+        return await update.message.reply_text(
+            "🚫 Perintah ini hanya untuk pemilik bot."
+        )
+
+    stats = get_fetch_stats()
+    breakers = get_breaker_stats()
+    if not stats and not breakers:
+        return await update.message.reply_text("ℹ️ Belum ada fetch yang tercatat.")
+
+    baris = ["<b>📊 Statistik Fetch EPS</b>\n"]
+    for source, s in sorted(stats.items()):
+        baris.append(
+            f"<b>{source}</b>: {s['request']} req, "
+            f"304={s['not_modified']}, hash={s['hash_hit']}, "
+            f"parse={s['parsed']} → hit {s['hit_rate']:.0%}"
+        )
+    r = render_cache.stats()
+    baris.append(
+        f"\n<b>🧾 Render cache</b>: hit={r['hit']}, miss={r['miss']}, "
+        f"entri={r['entri']} → hit {r['hit_rate']:.0%}"
+    )
+    providers = get_provider_stats()
+    if providers:
+        baris.append("\n<b>💱 Provider Kurs</b>")
+        for nama, p in sorted(providers.items()):
+            baris.append(
+                f"<b>{nama}</b>: {p['request']} req, menang={p['menang']}, "
+                f"gagal={p['gagal']}, ditolak={p['ditolak']}, hedge {p['hedge_ms']} ms"
+            )
+    if breakers:
+        baris.append("\n<b>⚡ Circuit Breaker</b>")
+        for host, b in sorted(breakers.items()):
+            info = f"<b>{host}</b>: {b['state']}, gagal={b['failures']}, "
+            info += f"open={b['opened_total']}x, ditolak={b['rejected']}"
+            if b["next_probe_in"]:
+                info += f", probe {b['next_probe_in']}s lagi"
+            baris.append(info)
+    logger.info("[/fetchstats] %s %s", stats, breakers)
+    await update.message.reply_text("\n".join(baris), parse_mode="HTML")
@@ -20,7 +20,6 @@ def install_packages():
         "python-dotenv==1.2.1",
         "python-telegram-bot==20.7",
         "pytz==2025.2",
-        "requests==2.32.5",
         "six==1.17.0",
         "sniffio==1.3.1",
         "soupsieve==2.8",
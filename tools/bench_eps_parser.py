@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark parser tabel EPS: BeautifulSoup full-tree (cara lama) vs
+utils.eps_parser.parse_table_rows (streaming, tabel saja).
+
+Pemakaian (dari root repo):
+    python tools/bench_eps_parser.py [file.html ...] [--ulang N]
+
+Tanpa argumen, file fallback scraper (jadwal.html, pass1.html, pass2.html,
+reg.html di root, data/ atau tools/fixtures/hrdkorea/) yang dipakai.
+
+Kolom "sama" membandingkan hasil kedua parser. Untuk markup dengan <td>/<tr>
+yang tidak ditutup, hasil memang beda: bs4 menumpuk baris jadi satu, parser
+baru menutup tag secara implisit.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from utils.eps_parser import parse_table_rows  # noqa: E402
+
+DEFAULT_FILES = ("jadwal.html", "pass1.html", "pass2.html", "reg.html")
+
+
+def parse_bs4(html_text: str, max_rows: int = 10) -> list[list[str]]:
+    """Salinan logika scraper sebelum parser streaming."""
+    soup = BeautifulSoup(html_text, "html.parser")
+    rows = soup.select("table.tableType tr[id^='tr_']")
+    if not rows:
+        table = soup.find("table", class_="tableType") or soup.find("table")
+        if table:
+            rows = [tr for tr in table.find_all("tr") if tr.find_all("td")]
+    return [
+        [td.get_text(strip=True) for td in row.find_all("td")]
+        for row in rows[:max_rows]
+    ]
+
+
+def ukur(fn, html_text: str, ulang: int):
+    # waktu: ambil yang tercepat dari beberapa putaran
+    terbaik = float("inf")
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasil = fn(html_text)
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+
+    tracemalloc.start()
+    fn(html_text)
+    _, puncak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return hasil, terbaik * 1000, puncak / 1024
+
+
+def cari_default():
+    files = []
+    for nama in DEFAULT_FILES:
+        for path in (
+            nama,
+            os.path.join("data", nama),
+            os.path.join("tools", "fixtures", "hrdkorea", nama),
+        ):
+            if os.path.exists(path):
+                files.append(path)
+                break
+    return files
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("files", nargs="*")
+    ap.add_argument("--ulang", type=int, default=20)
+    args = ap.parse_args()
+
+    files = args.files or cari_default()
+    if not files:
+        print("Tidak ada file HTML. Berikan path halaman EPS yang disimpan.")
+        return 1
+
+    print(f"{'file':<28}{'bs4 ms':>9}{'baru ms':>9}{'bs4 KiB':>10}{'baru KiB':>10}  sama")
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            html_text = f.read()
+        lama, t_lama, m_lama = ukur(parse_bs4, html_text, args.ulang)
+        baru, t_baru, m_baru = ukur(parse_table_rows, html_text, args.ulang)
+        sama = lama == baru
+        print(
+            f"{os.path.basename(path):<28}{t_lama:>9.2f}{t_baru:>9.2f}"
+            f"{m_lama:>10.0f}{m_baru:>10.0f}  {'ya' if sama else 'TIDAK'}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
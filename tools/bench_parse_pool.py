@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Ukur lag event loop (proxy latensi moderasi) selama parsing berat berjalan,
+untuk mode parse pool inline / thread / process.
+
+Pemakaian (dari root repo):
+    python tools/bench_parse_pool.py [--parse N] [--baris N] [--maks-lag MS]
+
+Selama N parse halaman EPS besar berjalan, sebuah "moderator" palsu tidur
+5 ms berulang kali dan mencatat keterlambatannya bangun. Exit 1 kalau p99 lag
+mode thread/process melebihi --maks-lag.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils import parse_pool  # noqa: E402
+from utils.eps_parser import parse_table_rows  # noqa: E402
+
+FIXTURE = os.path.join(ROOT, "tools", "fixtures", "hrdkorea", "jadwal.html")
+TICK = 0.005
+
+
+def halaman_besar(baris: int) -> str:
+    """Gandakan baris tabel fixture jadwal sampai `baris` baris."""
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        html_text = f.read()
+    awal = html_text.index('<tr id="tr_0">')
+    akhir = html_text.index("</tbody>")
+    satu = html_text[awal:akhir]
+    ulang = -(-baris // satu.count("<tr "))
+    return html_text[:awal] + satu * ulang + html_text[akhir:]
+
+
+async def moderator(stop: asyncio.Event, lag: list):
+    while not stop.is_set():
+        mulai = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lag.append((time.perf_counter() - mulai - TICK) * 1000)
+
+
+async def jalankan(mode: str, html_text: str, n_parse: int):
+    parse_pool.PARSE_POOL = mode
+    parse_pool._executor, parse_pool._slots = None, None
+    stop, lag = asyncio.Event(), []
+    ticker = asyncio.create_task(moderator(stop, lag))
+    await asyncio.sleep(0.05)
+
+    mulai = time.perf_counter()
+    hasil = await asyncio.gather(
+        *(
+            parse_pool.run_parse(parse_table_rows, html_text, 10**6)
+            for _ in range(n_parse)
+        )
+    )
+    durasi = time.perf_counter() - mulai
+    stop.set()
+    await ticker
+    await parse_pool.shutdown_parse_pool()
+
+    lag.sort()
+    p99 = lag[min(len(lag) - 1, int(len(lag) * 0.99))]
+    return {
+        "baris": len(hasil[0]),
+        "detik": durasi,
+        "p50": statistics.median(lag),
+        "p99": p99,
+        "maks": lag[-1],
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--parse", type=int, default=8)
+    ap.add_argument("--baris", type=int, default=3000)
+    ap.add_argument("--maks-lag", type=float, default=50.0)
+    args = ap.parse_args()
+
+    html_text = halaman_besar(args.baris)
+    print(
+        f"{args.parse} parse x {len(html_text) / 1024:.0f} KiB, "
+        f"{parse_pool.PARSE_WORKERS} worker\n"
+    )
+    print(f"{'mode':<9}{'baris':>7}{'total s':>9}{'lag p50':>9}{'lag p99':>9}{'lag maks':>10}")
+    gagal = []
+    for mode in ("inline", "thread", "process"):
+        r = asyncio.run(jalankan(mode, html_text, args.parse))
+        print(
+            f"{mode:<9}{r['baris']:>7}{r['detik']:>9.2f}"
+            f"{r['p50']:>9.1f}{r['p99']:>9.1f}{r['maks']:>10.1f}"
+        )
+        if mode != "inline" and r["p99"] > args.maks_lag:
+            gagal.append(f"{mode}: lag p99 {r['p99']:.1f} ms > {args.maks_lag} ms")
+
+    if gagal:
+        print("\n❌ " + "; ".join(gagal))
+        return 1
+    print("\n✅ Event loop tetap responsif selama parsing di pool.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Cek hedged fetch kurs (utils/fx_providers.py) terhadap server stub lokal
+dengan latensi & respons yang diatur per skenario.
+
+Pemakaian (dari root repo):
+    python tools/check_fx_hedge.py
+
+Exit 1 kalau ada skenario yang gagal (provider pemenang salah, hedge tidak
+jalan, atau total waktu melebihi batas).
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils import fx_providers  # noqa: E402
+from utils.fx_providers import (  # noqa: E402
+    FxProvider,
+    ambil_kurs,
+    parse_currency_api,
+    parse_erapi,
+    parse_floatrates,
+)
+from utils.http_client import close_http_client  # noqa: E402
+
+BASE = "usd"
+KODE = ["idr", "krw", "jpy", "eur", "sgd", "myr", "twd", "hkd", "sar", "aud", "cny", "gbp"]
+LAMA = {BASE: 1.0, **{k: 10.0 + i for i, k in enumerate(KODE)}}
+
+
+def payload(format_: str, faktor: float = 1.0) -> dict:
+    rates = {k: v * faktor for k, v in LAMA.items() if k != BASE}
+    if format_ == "floatrates":
+        return {k: {"code": k.upper(), "rate": v} for k, v in rates.items()}
+    if format_ == "erapi":
+        return {"result": "success", "rates": {k.upper(): v for k, v in rates.items()}}
+    return {"date": "2024-01-01", BASE: rates}
+
+
+class Stub:
+    """Server HTTP lokal: tunda `latensi` detik lalu balas `status` + `body`."""
+
+    def __init__(self, latensi: float = 0.0, status: int = 200, body=None):
+        self.latensi, self.status, self.body = latensi, status, body
+        self.hit = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.hit += 1
+                time.sleep(stub.latensi)
+                data = json.dumps(stub.body).encode()
+                try:
+                    self.send_response(stub.status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except OSError:
+                    pass  # klien sudah membatalkan (hedge menang duluan)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/{path}"
+
+    def tutup(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def providers(stubs: list[Stub]) -> list[FxProvider]:
+    jenis = [
+        ("floatrates", "{base}.json", parse_floatrates),
+        ("erapi", "v6/latest/{BASE}", parse_erapi),
+        ("currency-api", "currencies/{base}.json", parse_currency_api),
+    ]
+    return [
+        FxProvider(f"stub-{nama}", stub.url(path), parse)
+        for (nama, path, parse), stub in zip(jenis, stubs)
+    ]
+
+
+# (nama, [(latensi, status, faktor)], provider pemenang, batas waktu, hit wajib per stub)
+SKENARIO = [
+    ("utama cepat", [(0.05, 200, 1.0), (0.05, 200, 1.0), (0.05, 200, 1.0)], 0, 0.5, [1, 0, 0]),
+    ("utama lambat → hedge", [(3.0, 200, 1.0), (0.05, 200, 1.0), (0.05, 200, 1.0)], 1, 1.0, [1, 1, 0]),
+    ("utama 500 → failover", [(0.0, 500, 1.0), (0.05, 200, 1.0), (0.05, 200, 1.0)], 1, 0.5, [1, 1, 0]),
+    ("utama ngawur → ditolak", [(0.0, 200, 100.0), (0.05, 200, 1.0), (0.05, 200, 1.0)], 1, 0.5, [1, 1, 0]),
+    ("dua lambat → hedge dua kali", [(3.0, 200, 1.0), (3.0, 200, 1.0), (0.05, 200, 1.0)], 2, 1.5, [1, 1, 1]),
+]
+
+
+async def jalankan(nama, konfigurasi, menang, batas, hit) -> bool:
+    formats = ["floatrates", "erapi", "currency-api"]
+    stubs = [
+        Stub(latensi, status, payload(fmt, faktor))
+        for (latensi, status, faktor), fmt in zip(konfigurasi, formats)
+    ]
+    daftar = providers(stubs)
+    try:
+        mulai = time.monotonic()
+        rates, pemenang = await ambil_kurs(BASE, LAMA, daftar)
+        durasi = time.monotonic() - mulai
+    finally:
+        for stub in stubs:
+            stub.tutup()
+
+    hit_aktual = [s.hit for s in stubs]
+    ok = (
+        pemenang == daftar[menang].nama
+        and rates.get("idr") == LAMA["idr"]
+        and durasi <= batas
+        and hit_aktual == hit
+    )
+    status = "OK  " if ok else "GAGAL"
+    print(f"{status} {nama:<30} {pemenang or '-':<20} {durasi * 1000:7.0f} ms  hit={hit_aktual}")
+    return ok
+
+
+async def main() -> int:
+    # Jeda hedge tetap supaya hasil deterministik
+    fx_providers.HEDGE_AWAL = 0.3
+    hasil = []
+    for skenario in SKENARIO:
+        hasil.append(await jalankan(*skenario))
+    await close_http_client()
+    print(f"\n{sum(hasil)}/{len(hasil)} skenario lolos")
+    return 0 if all(hasil) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Cek fetch layer async (utils/http_client.py) terhadap server stub lokal:
+event loop harus tetap melayani coroutine lain selama fetch lambat berjalan.
+
+Pemakaian (dari root repo):
+    python tools/check_http_client.py
+
+Exit 1 kalau ada skenario yang gagal (loop tersendat, batas per host tidak
+berlaku, atau retry tidak jalan).
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils import http_client  # noqa: E402
+from utils.http_client import close_http_client, fetch  # noqa: E402
+
+LAMBAT = 1.5  # detik, latensi stub untuk fetch "lambat"
+TICK = 0.01  # detik, interval coroutine pengganti update lain
+BATAS_LAG = 0.05  # detik, keterlambatan tick maksimum yang masih wajar
+
+
+class Stub:
+    """Server HTTP lokal: tunda `latensi` detik; `gagal` request pertama dibalas 503."""
+
+    def __init__(self, latensi: float = 0.0, gagal: int = 0):
+        self.latensi, self.gagal = latensi, gagal
+        self.hit = 0
+        self.paralel = self.paralel_maks = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.hit += 1
+                    ke = stub.hit
+                    stub.paralel += 1
+                    stub.paralel_maks = max(stub.paralel_maks, stub.paralel)
+                try:
+                    time.sleep(stub.latensi)
+                    status = 503 if ke <= stub.gagal else 200
+                    self.send_response(status)
+                    self.send_header("Content-Length", "2")
+                    self.end_headers()
+                    self.wfile.write(b"ok")
+                except OSError:
+                    pass
+                finally:
+                    with stub._lock:
+                        stub.paralel -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def tutup(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+async def ticker(berhenti: asyncio.Event) -> list[float]:
+    """Tidur TICK berulang dan catat seberapa telat tiap bangun (lag event loop)."""
+    lag = []
+    while not berhenti.is_set():
+        mulai = time.monotonic()
+        await asyncio.sleep(TICK)
+        lag.append(time.monotonic() - mulai - TICK)
+    return lag
+
+
+async def loop_tetap_jalan() -> tuple[bool, str]:
+    stub = Stub(latensi=LAMBAT)
+    berhenti = asyncio.Event()
+    try:
+        tugas_tick = asyncio.create_task(ticker(berhenti))
+        mulai = time.monotonic()
+        resp = await fetch(stub.url)
+        durasi = time.monotonic() - mulai
+        berhenti.set()
+        lag = await tugas_tick
+    finally:
+        stub.tutup()
+    ok = (
+        resp.status_code == 200
+        and durasi >= LAMBAT
+        and len(lag) >= LAMBAT / TICK * 0.5
+        and max(lag) <= BATAS_LAG
+    )
+    return ok, f"{len(lag)} tick, lag maks {max(lag) * 1000:.1f} ms, fetch {durasi:.2f}s"
+
+
+async def batas_per_host() -> tuple[bool, str]:
+    stub = Stub(latensi=0.3)
+    n = http_client.MAX_PER_HOST * 2
+    try:
+        mulai = time.monotonic()
+        hasil = await asyncio.gather(*(fetch(stub.url) for _ in range(n)))
+        durasi = time.monotonic() - mulai
+    finally:
+        stub.tutup()
+    ok = (
+        all(r.status_code == 200 for r in hasil)
+        and stub.paralel_maks == http_client.MAX_PER_HOST
+        and durasi >= 0.6
+    )
+    return ok, f"{n} request, paralel maks {stub.paralel_maks}, {durasi:.2f}s"
+
+
+async def retry_503() -> tuple[bool, str]:
+    stub = Stub(gagal=http_client.RETRIES)
+    try:
+        resp = await fetch(stub.url)
+    finally:
+        stub.tutup()
+    ok = resp.status_code == 200 and stub.hit == http_client.RETRIES + 1
+    return ok, f"status {resp.status_code} setelah {stub.hit} hit"
+
+
+SKENARIO = [
+    ("loop tetap jalan saat fetch lambat", loop_tetap_jalan),
+    ("batas koneksi per host", batas_per_host),
+    ("retry 503", retry_503),
+]
+
+
+async def main() -> int:
+    hasil = []
+    for nama, fn in SKENARIO:
+        ok, info = await fn()
+        print(f"{'OK  ' if ok else 'GAGAL'} {nama:<36} {info}")
+        hasil.append(ok)
+    await close_http_client()
+    print(f"\n{sum(hasil)}/{len(hasil)} skenario lolos")
+    return 0 if all(hasil) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
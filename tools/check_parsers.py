@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Cek & benchmark semua parser scraper secara offline pakai korpus di tools/fixtures.
+
+Pemakaian (dari root repo):
+    python tools/check_parsers.py [--ulang N] [--toleransi X] [--update]
+
+Tiap fixture diparse oleh parser terkait lalu dibandingkan dengan
+tools/fixtures/expected.json (kebenaran). Kecepatan dinilai relatif: di run
+yang sama fixture juga diparse BeautifulSoup (referensi), dan rasio
+parser/referensi dibandingkan dengan rasio di tools/fixtures/baseline.json.
+Jadi hasilnya sama di mesin cepat maupun lambat (STB/Termux, CI yang sibuk).
+Exit 1 kalau ada hasil yang beda, atau rasio naik melebihi baseline x
+toleransi. --update menulis ulang kedua file dari hasil sekarang (jalankan
+hanya setelah perubahan output memang disengaja); ms absolut ikut dicatat
+di baseline.json sebagai info saja.
+"""
+import argparse
+import html
+import json
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from utils.announcement_store import parse_judul_link as parse_judul_kp2mi  # noqa: E402
+from utils.eps_parser import parse_table_rows  # noqa: E402
+from utils.monitor_utils import parse_judul_link as parse_judul_monitor  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "tools", "fixtures")
+EXPECTED_FILE = os.path.join(FIXTURES, "expected.json")
+BASELINE_FILE = os.path.join(FIXTURES, "baseline.json")
+# Fixture dengan referensi secepat ini terlalu kecil untuk diukur; rasio tidak dinilai
+REFERENSI_MIN_MS = 0.05
+
+
+# === Adapter: fixture mentah -> hasil yang bisa dibandingkan (JSON) ===
+def _judul_link(parser):
+    def jalankan(raw: str):
+        hasil = []
+        for item in json.loads(raw).get("data", []):
+            try:
+                hasil.append(list(parser(item.get("judul"))))
+            except Exception as e:
+                hasil.append(f"!{type(e).__name__}")
+        return hasil
+
+    return jalankan
+
+
+# === Referensi kecepatan: BeautifulSoup atas input yang sama ===
+def _ref_html(raw: str):
+    BeautifulSoup(raw, "html.parser")
+
+
+def _ref_judul(raw: str):
+    for item in json.loads(raw).get("data", []):
+        try:
+            BeautifulSoup(html.unescape(item.get("judul") or ""), "html.parser")
+        except Exception:
+            pass
+
+
+# nama parser -> (subfolder fixture, fungsi, referensi)
+PARSERS = {
+    "eps_table": ("hrdkorea", parse_table_rows, _ref_html),
+    "kp2mi": ("kp2mi", _judul_link(parse_judul_kp2mi), _ref_judul),
+    "monitor": ("kp2mi", _judul_link(parse_judul_monitor), _ref_judul),
+}
+
+
+def _baca_json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def ukur(fn, ref, raw: str, ulang: int):
+    """
+    Return (hasil, ms parser, ms referensi), masing-masing yang terbaik dari
+    `ulang` putaran. Parser & referensi diselang-seling supaya beban mesin
+    yang berubah-ubah kena ke keduanya.
+    """
+    terbaik = terbaik_ref = float("inf")
+    hasil = None
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasil = fn(raw)
+        tengah = time.perf_counter()
+        ref(raw)
+        selesai = time.perf_counter()
+        terbaik = min(terbaik, tengah - mulai)
+        terbaik_ref = min(terbaik_ref, selesai - tengah)
+    return hasil, terbaik * 1000, terbaik_ref * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--ulang", type=int, default=30)
+    ap.add_argument("--toleransi", type=float, default=2.0)
+    ap.add_argument("--update", action="store_true")
+    args = ap.parse_args()
+    # Log parser (mis. "tag <a> tidak ditemukan") hanya mengotori output & timing
+    logging.disable(logging.CRITICAL)
+
+    expected = _baca_json(EXPECTED_FILE)
+    baseline = _baca_json(BASELINE_FILE)
+    hasil_baru, waktu_baru = {}, {}
+    gagal = []
+
+    print(
+        f"{'parser/fixture':<36}{'baris':>6}{'ms/hal':>9}{'ref ms':>9}"
+        f"{'rasio':>8}{'base':>8}  status"
+    )
+    for nama, (folder, fn, ref) in PARSERS.items():
+        folder_path = os.path.join(FIXTURES, folder)
+        for file in sorted(os.listdir(folder_path)):
+            key = f"{nama}/{file}"
+            with open(os.path.join(folder_path, file), "r", encoding="utf-8") as f:
+                raw = f.read()
+            hasil, ms, ms_ref = ukur(fn, ref, raw, args.ulang)
+            rasio = ms / ms_ref if ms_ref > 0 else 0.0
+            hasil_baru[key] = hasil
+            waktu_baru[key] = {"rasio": round(rasio, 3), "ms": round(ms, 3)}
+
+            baris = len(hasil)
+            base = baseline.get(key)
+            # Format lama (ms absolut saja) tidak bisa dipakai lintas mesin
+            base = base.get("rasio") if isinstance(base, dict) else None
+            status = "ok"
+            if not args.update:
+                if key not in expected:
+                    status = "BARU"
+                    gagal.append(f"{key}: belum ada di expected.json")
+                elif hasil != expected[key]:
+                    status = "BEDA"
+                    gagal.append(f"{key}: hasil parse berubah")
+                elif (
+                    base is not None
+                    and ms_ref >= REFERENSI_MIN_MS
+                    and rasio > base * args.toleransi
+                ):
+                    status = "LAMBAT"
+                    gagal.append(
+                        f"{key}: rasio {rasio:.2f}x referensi > baseline {base:.2f}x"
+                    )
+            print(
+                f"{key:<36}{baris:>6}{ms:>9.3f}{ms_ref:>9.3f}{rasio:>8.2f}"
+                f"{base if base is not None else '-':>8}  {status}"
+            )
+
+    if args.update:
+        for path, isi in ((EXPECTED_FILE, hasil_baru), (BASELINE_FILE, waktu_baru)):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(isi, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+        print(f"\n💾 expected.json & baseline.json diperbarui ({len(hasil_baru)} fixture).")
+        return 0
+
+    if gagal:
+        print("\n❌ Regresi parser:")
+        for pesan in gagal:
+            print(f"  - {pesan}")
+        return 1
+    print(f"\n✅ {len(hasil_baru)} fixture lolos.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
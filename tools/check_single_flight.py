@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Cek single-flight refresh sumber EPS (utils/single_flight.py lewat
+utils/prefetch.py) terhadap server stub lokal: banyak command bersamaan
+harus berbagi satu request upstream dan satu penulisan cache.
+
+Pemakaian (dari root repo):
+    python tools/check_single_flight.py [--jumlah 50]
+
+Exit 1 kalau stub menerima lebih dari satu request, cache ditulis lebih dari
+sekali, atau ada pemanggil yang mendapat hasil berbeda.
+"""
+import argparse
+import asyncio
+import dataclasses
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils import eps_pipeline, prefetch  # noqa: E402
+from utils.eps_sources import EPS_SOURCES  # noqa: E402
+from utils.http_client import close_http_client  # noqa: E402
+from utils.parse_pool import shutdown_parse_pool  # noqa: E402
+
+FIXTURE = os.path.join(ROOT, "tools", "fixtures", "hrdkorea", "pass1.html")
+LATENSI = 0.5  # detik; cukup lama supaya semua command datang saat fetch berjalan
+
+
+class Stub:
+    """Server HTTP lokal yang menyajikan `body` setelah `latensi` detik."""
+
+    def __init__(self, body: bytes, latensi: float):
+        self.body, self.latensi = body, latensi
+        self.hit = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.hit += 1
+                time.sleep(stub.latensi)
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(stub.body)))
+                    self.end_headers()
+                    self.wfile.write(stub.body)
+                except OSError:
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/pass1"
+
+    def tutup(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jumlah", type=int, default=50, help="command bersamaan")
+    args = parser.parse_args()
+
+    with open(FIXTURE, "rb") as f:
+        stub = Stub(f.read(), LATENSI)
+    folder = tempfile.mkdtemp(prefix="check_single_flight.")
+    source = dataclasses.replace(
+        EPS_SOURCES["pass1"],
+        key="stub_pass1",
+        url=stub.url,
+        fallback_file=os.path.join(folder, "tidak_ada.html"),
+        cache_file=os.path.join(folder, "pass1.json"),
+    )
+    prefetch.register_source(source.key, eps_pipeline._make_refresher(source))
+
+    # Hitung penulisan cache tanpa mengubah perilakunya
+    tulis = 0
+    simpan_asli = eps_pipeline.simpan_cache
+
+    async def simpan_terhitung(src, data):
+        nonlocal tulis
+        if src.key == source.key:
+            tulis += 1
+        await simpan_asli(src, data)
+
+    eps_pipeline.simpan_cache = simpan_terhitung
+    try:
+        mulai = time.monotonic()
+        hasil = await asyncio.gather(
+            *(prefetch.read_or_refresh(source.key) for _ in range(args.jumlah))
+        )
+        durasi = time.monotonic() - mulai
+        hit_serentak = stub.hit
+
+        # Gelombang kedua setelah fetch selesai: data masih segar → tanpa jaringan
+        kedua = await asyncio.gather(
+            *(prefetch.read_or_refresh(source.key) for _ in range(args.jumlah))
+        )
+    finally:
+        eps_pipeline.simpan_cache = simpan_asli
+        stub.tutup()
+        await close_http_client()
+        await shutdown_parse_pool()
+
+    identik = bool(hasil[0]) and all(h == hasil[0] for h in hasil)
+    cek = [
+        (f"{args.jumlah} command bersamaan → 1 request upstream", hit_serentak == 1, f"hit={hit_serentak}"),
+        ("cache ditulis sekali", tulis == 1, f"tulis={tulis}"),
+        ("semua hasil identik & tidak kosong", identik, f"{len(hasil[0])} baris"),
+        ("gelombang kedua dari memori", stub.hit == 1 and kedua == hasil, f"hit={stub.hit}"),
+        ("total waktu ≈ satu fetch", durasi < LATENSI * 3, f"{durasi:.2f}s"),
+    ]
+    for nama, ok, info in cek:
+        print(f"{'OK  ' if ok else 'GAGAL'} {nama:<46} {info}")
+    lolos = sum(ok for _, ok, _ in cek)
+    print(f"\n{lolos}/{len(cek)} cek lolos")
+    return 0 if lolos == len(cek) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
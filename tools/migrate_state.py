@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Migrasi sekali jalan state bot dari file data/*.json (dan shard snapshot
+akun data/eps_cache_*/) ke SQLite untuk STATE_BACKEND=sqlite.
+
+Pemakaian (dari root repo, bot dalam keadaan mati):
+    python tools/migrate_state.py [--db data/state.db] [--hanya autoreply.json ...]
+
+Aman dijalankan ulang: tulis ke DB berupa diff, jadi baris yang sama tidak
+ditulis dua kali. File JSON tidak dihapus (untuk rollback ke STATE_BACKEND=json).
+File config yang diedit dengan tangan setelah migrasi (autoreply.json,
+topik_ids.json, moderation_keywords.json) diimpor ulang otomatis oleh bot;
+--hanya tetap bisa dipakai untuk memaksa impor satu file.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.constants import (  # noqa: E402
+    BLACKLIST_LINK,
+    DATA_DIR,
+    LINK,
+    RESPON_FILE,
+    STATE_DB,
+    WHITELIST_LINK,
+)
+from utils.state_db import StateDB  # noqa: E402
+
+# Config yang diedit manual & hanya dibaca bot: tetap berupa file
+TETAP_FILE = {RESPON_FILE, WHITELIST_LINK, BLACKLIST_LINK, LINK}
+SNAPSHOT_LOG = {"auto": "eps_cache_auto", "manual": "eps_cache_manual"}
+
+
+def migrasi_dokumen(db: StateDB, hanya: set) -> int:
+    total = 0
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "*.json"))):
+        nama = os.path.basename(path)
+        if path in TETAP_FILE or (hanya and nama not in hanya):
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  LEWAT {nama}: {e}")
+            continue
+        berubah = db.tulis_dokumen(path, data)
+        total += berubah
+        print(f"  {nama:<32} {berubah:>6} baris berubah")
+    return total
+
+
+def migrasi_snapshot(db: StateDB) -> int:
+    total = 0
+    for log, folder in SNAPSHOT_LOG.items():
+        shards = sorted(glob.glob(os.path.join(DATA_DIR, folder, "*.jsonl")))
+        if not shards:
+            continue
+        sudah = db.snapshot_jumlah(log)
+        if sudah:
+            print(f"  snapshot {log}: sudah ada {sudah} baris di DB, dilewati")
+            continue
+        n = 0
+        for shard in shards:
+            uid = os.path.basename(shard)[: -len(".jsonl")]
+            with open(shard, "r", encoding="utf-8") as f:
+                for baris in f:
+                    if not baris.endswith("\n"):
+                        break  # baris terakhir terpotong
+                    entry = json.loads(baris)
+                    db.snapshot_tambah(log, uid, entry.pop("akun"), entry)
+                    n += 1
+        print(f"  snapshot {log:<23} {n:>6} baris dari {len(shards)} user")
+        total += n
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default=STATE_DB)
+    parser.add_argument("--hanya", nargs="*", default=[], help="nama file di data/ saja")
+    args = parser.parse_args()
+
+    db = StateDB(args.db)
+    print(f"📦 Migrasi state ke {args.db}")
+    total = migrasi_dokumen(db, set(args.hanya))
+    if not args.hanya:
+        total += migrasi_snapshot(db)
+    db.close()
+    print(f"✅ Selesai: {total} baris ditulis. Aktifkan dengan STATE_BACKEND=sqlite di .env")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+# utils/announcement_store.py
+import logging
+from html import unescape
+
+from bs4 import BeautifulSoup
+
+from .json_store import baca_json, json_store, mtime_json
+from .parse_pool import run_parse
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://www.kp2mi.go.id"
+# Field yang boleh berubah untuk ID yang sama; sisanya (judul/link) tetap
+MUTABLE_FIELDS = ("view", "updated_at", "is_active", "kategori", "tanggal", "creator")
+
+
+# === Parser judul & link ===
+def parse_judul_link(html_string):
+    if not html_string or not isinstance(html_string, str):
+        return "Judul tidak ditemukan", "-"
+    raw_html = unescape(html_string)
+    soup = BeautifulSoup(raw_html, "html.parser")
+    a = soup.find("a")
+    if not a or not a.get("href"):
+        return "Judul tidak ditemukan", "-"
+    teks = a.get_text(strip=True)
+    href = a["href"].replace("\\/", "/").strip()
+    if href.startswith("/"):
+        href = f"{BASE_URL}{href}"
+    return teks, href
+
+
+def _item_baru(raw: dict):
+    judul, link = parse_judul_link(raw.get("judul", ""))
+    if judul == "Judul tidak ditemukan" or link == "-":
+        return None
+    return {
+        "id": raw.get("id"),
+        "judul": judul,
+        "link": link,
+        "creator": raw.get("creator", "-"),
+        "is_active": raw.get("is_active", 1),
+        "created_at": raw.get("created_at", "-"),
+        "updated_at": raw.get("updated_at", "-"),
+        "view": raw.get("view", 0),
+        "kategori": raw.get("kategori", "-"),
+        "tanggal": raw.get("tanggal", "-"),
+    }
+
+
+def parse_items(raws: list) -> list:
+    """Parse batch item mentah → item bersih (None kalau judul tidak valid).
+    Top-level & return dict biasa supaya bisa jalan di parse pool."""
+    return [_item_baru(raw) for raw in raws]
+
+
+class AnnouncementStore:
+    """
+    Cache pengumuman kp2mi per ID. Judul HTML hanya di-parse saat ID pertama
+    kali muncul; refresh berikutnya cuma menyalin field yang berubah (view, dll)
+    dan menulis file sekali, itu pun kalau memang ada perubahan.
+    """
+
+    def __init__(self, path: str, nama: str):
+        self.path = path
+        self.nama = nama
+        self._items: dict = {}  # id -> item bersih, urut sesuai halaman API
+        self._ditolak: set = set()  # ID yang judulnya tidak valid, tidak di-parse ulang
+        self._loaded = False
+        self.parsed = 0  # jumlah judul yang di-parse (untuk log/benchmark)
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        data = baca_json(self.path, [])
+        self._items = {item["id"]: item for item in data if "id" in item}
+
+    def items(self) -> list:
+        self._load()
+        return list(self._items.values())
+
+    def mtime(self):
+        return mtime_json(self.path)
+
+    def perlu_parse(self, api_data: list) -> list:
+        """Item mentah yang ID-nya belum pernah dilihat (judul perlu di-parse)."""
+        self._load()
+        return [
+            raw
+            for raw in api_data
+            if raw.get("id") not in self._items and raw.get("id") not in self._ditolak
+        ]
+
+    async def merge_async(self, api_data: list) -> list:
+        """Seperti merge(), tapi parse judul baru di parse pool (di luar event loop)."""
+        raws = self.perlu_parse(api_data)
+        parsed = await run_parse(parse_items, raws) if raws else []
+        return self.merge(api_data, {raw.get("id"): item for raw, item in zip(raws, parsed)})
+
+    def merge(self, api_data: list, parsed: dict | None = None) -> list:
+        """
+        Gabungkan satu halaman API. Return item yang ID-nya baru.
+        `parsed` (id -> item|None) berisi hasil parse dari luar; ID yang tidak
+        ada di situ di-parse langsung.
+        """
+        self._load()
+        parsed = parsed or {}
+        hasil, baru = {}, []
+        berubah = False
+        for raw in api_data:
+            item_id = raw.get("id")
+            item = self._items.get(item_id)
+            if item is None:
+                if item_id in self._ditolak:
+                    continue
+                self.parsed += 1
+                item = parsed[item_id] if item_id in parsed else _item_baru(raw)
+                if item is None:
+                    self._ditolak.add(item_id)
+                    continue
+                baru.append(item)
+                berubah = True
+            else:
+                ubah = {
+                    field: raw[field]
+                    for field in MUTABLE_FIELDS
+                    if field in raw and raw[field] != item.get(field)
+                }
+                if ubah:
+                    # dict baru (bukan mutasi) supaya snapshot lama tetap utuh
+                    # dan perubahan view dkk terdeteksi sebagai versi data baru
+                    item = {**item, **ubah}
+                    berubah = True
+            hasil[item_id] = item
+
+        if not hasil:
+            return []  # halaman kosong/rusak: jangan timpa cache lama
+        if list(hasil) != list(self._items):
+            berubah = True
+        self._items = hasil
+        if berubah:
+            self._simpan()
+        logger.info(
+            "📥 %s: %d item, %d baru, %s",
+            self.nama,
+            len(hasil),
+            len(baru),
+            "cache ditulis" if berubah else "tanpa perubahan",
+        )
+        return baru
+
+    def _simpan(self):
+        json_store.jadwalkan(
+            self.path, list(self._items.values()), ensure_ascii=False, indent=2
+        )
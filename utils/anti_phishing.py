@@ -4,7 +4,8 @@ import json
 import logging
 from telegram import Update
 from telegram.ext import ContextTypes
-from .constants import BANNED_FILE, BLACKLIST_LINK, WHITELIST_LINK
+from .constants import BANNED_FILE, BLACKLIST_LINK, PHISHING_CACHE_FILE, WHITELIST_LINK
+from .json_store import baca_json, json_store
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -27,7 +28,7 @@ def _parse_admin_ids(raw: str) -> list[int]:
 ADMIN_IDS = _parse_admin_ids(os.getenv("ADMIN_LIST", ""))
 OWNER_ID = int(os.getenv("MY_TELEGRAM_ID", "0"))
 
-CACHE_PHISHING_FILE = "data/cache_phishing_links.json"
+CACHE_PHISHING_FILE = PHISHING_CACHE_FILE
 MODERASI_LOG_FILE = "logs/moderasi.log"
 
 # === Setup Logger Moderasi ===
@@ -50,27 +51,21 @@ def load_json_list(path: str) -> list:
 
 
 def load_phishing_cache() -> set:
-    try:
-        with open(CACHE_PHISHING_FILE, "r", encoding="utf-8") as f:
-            return set(json.load(f))
-    except (FileNotFoundError, json.JSONDecodeError):
-        return set()
+    return set(baca_json(CACHE_PHISHING_FILE, []))
 
 
 def save_phishing_cache(links: set):
-    with open(CACHE_PHISHING_FILE, "w", encoding="utf-8") as f:
-        json.dump(list(links), f, indent=2)
+    # Cache bisa ter-update beruntun saat spam link; cukup ditulis sekali
+    json_store.jadwalkan(CACHE_PHISHING_FILE, list(links), debounce=2.0, indent=2)
 
 
-def save_banned_user(user_id: int):
-    try:
-        with open(BANNED_FILE, "r", encoding="utf-8") as f:
-            data = set(json.load(f))
-    except (FileNotFoundError, json.JSONDecodeError):
-        data = set()
-    data.add(user_id)
-    with open(BANNED_FILE, "w", encoding="utf-8") as f:
-        json.dump(list(data), f, indent=2)
+async def save_banned_user(user_id: int):
+    def tambah(data):
+        data = set(data or [])
+        data.add(user_id)
+        return list(data)
+
+    await json_store.perbarui(BANNED_FILE, tambah, default=[], indent=2)
     logging.info(f"📁 User {user_id} ditambahkan ke banned_users.json")
 
 
@@ -188,7 +183,7 @@ async def handle_phishing(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         try:
             await context.bot.ban_chat_member(chat_id, user_id)
             logging.warning(f"🚫 User {user_id} dibanned karena link mencurigakan.")
-            save_banned_user(user_id)
+            await save_banned_user(user_id)
         except Exception as e:
             logging.error(f"❌ Gagal memban user: {e}")
 
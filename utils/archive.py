@@ -0,0 +1,202 @@
+# utils/archive.py
+"""
+Arsip permanen semua pengumuman/jadwal/hasil EPS & kp2mi yang pernah di-scrape.
+Disimpan di SQLite dengan index full-text FTS5 (fallback LIKE kalau build
+SQLite tidak punya FTS5), diisi otomatis dari hasil prefetch.
+"""
+import asyncio
+import logging
+import re
+import sqlite3
+import threading
+import time
+
+from .constants import ARCHIVE_DB
+from .eps_sources import EPS_SOURCES
+from .prefetch import add_listener
+
+logger = logging.getLogger(__name__)
+
+# Label sumber kp2mi (EPS pakai EpsSource.nama)
+KP2MI_LABEL = {"info": "pengumuman G to G", "prelim": "preliminary training"}
+# Kolom EPS yang dianggap tanggal (urutan prioritas)
+_FIELD_TANGGAL = ("date", "announcement_date", "result_date", "test_date", "period")
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS arsip (
+    id INTEGER PRIMARY KEY,
+    sumber TEXT NOT NULL,
+    kunci TEXT NOT NULL,
+    judul TEXT NOT NULL,
+    isi TEXT NOT NULL,
+    link TEXT,
+    tanggal TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    UNIQUE (sumber, kunci)
+);
+"""
+_SCHEMA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS arsip_fts USING fts5(
+    judul, isi, content='arsip', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS arsip_ai AFTER INSERT ON arsip BEGIN
+    INSERT INTO arsip_fts(rowid, judul, isi) VALUES (new.id, new.judul, new.isi);
+END;
+CREATE TRIGGER IF NOT EXISTS arsip_ad AFTER DELETE ON arsip BEGIN
+    INSERT INTO arsip_fts(arsip_fts, rowid, judul, isi)
+    VALUES ('delete', old.id, old.judul, old.isi);
+END;
+CREATE TRIGGER IF NOT EXISTS arsip_au AFTER UPDATE OF judul, isi ON arsip BEGIN
+    INSERT INTO arsip_fts(arsip_fts, rowid, judul, isi)
+    VALUES ('delete', old.id, old.judul, old.isi);
+    INSERT INTO arsip_fts(rowid, judul, isi) VALUES (new.id, new.judul, new.isi);
+END;
+"""
+
+
+class Archive:
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._fts = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            try:
+                conn.executescript(_SCHEMA_FTS)
+                self._fts = True
+            except sqlite3.OperationalError:
+                logger.warning("SQLite tanpa FTS5, pencarian arsip pakai LIKE.")
+            self._conn = conn
+        return self._conn
+
+    # === Tulis ===
+    def simpan(self, sumber: str, rows: list[dict]) -> int:
+        """Upsert baris arsip; return jumlah baris yang benar-benar baru."""
+        if not rows:
+            return 0
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                # rowcount hanya menghitung baris arsip, bukan tulisan trigger FTS
+                cur = conn.executemany(
+                    "INSERT OR IGNORE INTO arsip "
+                    "(sumber, kunci, judul, isi, link, tanggal, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (sumber, r["kunci"], r["judul"], r["isi"])
+                        + (r["link"], r["tanggal"], now, now)
+                        for r in rows
+                    ],
+                )
+                baru = cur.rowcount
+                conn.executemany(
+                    "UPDATE arsip SET last_seen = ? WHERE sumber = ? AND kunci = ?",
+                    [(now, sumber, r["kunci"]) for r in rows],
+                )
+        return baru
+
+    # === Cari ===
+    @staticmethod
+    def _query_fts(teks: str):
+        # Tiap kata jadi prefix-term yang di-quote: aman dari sintaks FTS5
+        token = _TOKEN.findall(teks.lower())
+        return " ".join(f'"{t}"*' for t in token) if token else None
+
+    def cari(self, teks: str, limit: int = 5) -> list[dict]:
+        with self._lock:
+            conn = self._connect()
+            if self._fts:
+                query = self._query_fts(teks)
+                if not query:
+                    return []
+                cur = conn.execute(
+                    "SELECT a.* FROM arsip_fts f JOIN arsip a ON a.id = f.rowid "
+                    "WHERE arsip_fts MATCH ? "
+                    "ORDER BY bm25(arsip_fts, 5.0, 1.0), a.first_seen DESC LIMIT ?",
+                    (query, limit),
+                )
+            else:
+                token = _TOKEN.findall(teks.lower())
+                if not token:
+                    return []
+                syarat = " AND ".join("(judul || ' ' || isi) LIKE ?" for _ in token)
+                cur = conn.execute(
+                    f"SELECT * FROM arsip WHERE {syarat} ORDER BY first_seen DESC LIMIT ?",
+                    [f"%{t}%" for t in token] + [limit],
+                )
+            return [dict(row) for row in cur.fetchall()]
+
+    def jumlah(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM arsip").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+archive = Archive(ARCHIVE_DB)
+
+
+# === Normalisasi data feed → baris arsip ===
+def _baris_kp2mi(item: dict) -> dict:
+    return {
+        "kunci": str(item.get("id")),
+        "judul": item.get("judul", "-"),
+        "isi": " ".join(
+            str(item.get(f, "")) for f in ("kategori", "creator", "tanggal")
+        ),
+        "link": item.get("link"),
+        "tanggal": item.get("tanggal"),
+    }
+
+
+def _baris_eps(source, item: dict) -> dict:
+    nilai = [item.get(f, "") for f in source.fields]
+    tanggal = next((item[f] for f in _FIELD_TANGGAL if item.get(f)), None)
+    return {
+        "kunci": "|".join(nilai),
+        "judul": item.get("title") or nilai[0],
+        "isi": " ".join(nilai),
+        "link": source.url,
+        "tanggal": tanggal,
+    }
+
+
+def label_sumber(sumber: str) -> str:
+    if sumber in EPS_SOURCES:
+        return EPS_SOURCES[sumber].nama
+    return KP2MI_LABEL.get(sumber, sumber)
+
+
+async def _arsipkan(key: str, data: list):
+    if key in KP2MI_LABEL:
+        rows = [_baris_kp2mi(item) for item in data if item.get("id") is not None]
+    elif key in EPS_SOURCES:
+        rows = [_baris_eps(EPS_SOURCES[key], item) for item in data]
+    else:
+        return
+    baru = await asyncio.to_thread(archive.simpan, key, rows)
+    if baru:
+        logger.info("🗄️ Arsip %s: %d baris baru", key, baru)
+
+
+async def cari_arsip(teks: str, limit: int = 5) -> list[dict]:
+    return await asyncio.to_thread(archive.cari, teks, limit)
+
+
+def setup_archive():
+    """Arsipkan setiap hasil refresh segar dari prefetch."""
+    add_listener(_arsipkan)
@@ -0,0 +1,63 @@
+# utils/batch_sender.py
+import asyncio
+import logging
+import time
+
+from telegram.error import Forbidden, RetryAfter, TelegramError
+
+logger = logging.getLogger(__name__)
+
+# Batas aman di bawah limit global Telegram (~30 pesan/detik)
+PESAN_PER_DETIK = 20
+
+
+class BatchSender:
+    """
+    Antrian kirim pesan dengan rate limit. Banyak notifikasi sekaligus
+    (mis. alert kurs) cukup di-enqueue; satu worker yang mengirim dengan
+    jeda tetap dan menghormati RetryAfter dari Telegram.
+    """
+
+    def __init__(self, bot, per_detik: int = PESAN_PER_DETIK):
+        self.bot = bot
+        self.jeda = 1.0 / max(1, per_detik)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+        self.terkirim = 0
+        self.gagal = 0
+
+    def kirim(self, chat_id, text: str, **kwargs):
+        self._queue.put_nowait((chat_id, text, kwargs))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._jalan())
+
+    async def _jalan(self):
+        while not self._queue.empty():
+            chat_id, text, kwargs = await self._queue.get()
+            mulai = time.monotonic()
+            await self._kirim_satu(chat_id, text, kwargs)
+            sisa = self.jeda - (time.monotonic() - mulai)
+            if sisa > 0:
+                await asyncio.sleep(sisa)
+
+    async def _kirim_satu(self, chat_id, text: str, kwargs: dict):
+        for _ in range(3):
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text, **kwargs)
+                self.terkirim += 1
+                return
+            except RetryAfter as e:
+                logger.warning("⏳ Flood limit, tunggu %ss", e.retry_after)
+                await asyncio.sleep(float(e.retry_after))
+            except Forbidden:
+                # user belum /start bot atau sudah blokir
+                logger.info("🚫 Tidak bisa kirim ke %s (forbidden)", chat_id)
+                break
+            except TelegramError:
+                logger.exception("Gagal kirim pesan ke %s", chat_id)
+                break
+        self.gagal += 1
+
+    async def tunggu_selesai(self):
+        if self._worker is not None:
+            await self._worker
@@ -0,0 +1,141 @@
+# utils/circuit_breaker.py
+import logging
+import os
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+# Bisa dioverride lewat .env
+BREAKER_THRESHOLD = int(os.getenv("BREAKER_THRESHOLD", "3"))  # gagal beruntun sebelum open
+BREAKER_BASE_DELAY = float(os.getenv("BREAKER_BASE_DELAY", "30"))  # detik, jeda probe pertama
+BREAKER_MAX_DELAY = float(os.getenv("BREAKER_MAX_DELAY", "900"))  # batas atas jeda probe
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Host sedang dianggap down; request ditolak tanpa menyentuh jaringan."""
+
+    def __init__(self, host: str, sisa: float):
+        super().__init__(f"circuit {host} open, probe lagi dalam {sisa:.0f}s")
+        self.host = host
+        self.sisa = sisa
+
+
+class CircuitBreaker:
+    """
+    Breaker per host:
+      closed    → request jalan normal, gagal beruntun dihitung
+      open      → request langsung ditolak sampai jadwal probe berikutnya
+      half_open → satu request probe boleh lewat; sukses → closed, gagal → open lagi
+    Jeda probe naik eksponensial (base * 2^n, maks max_delay) dengan jitter.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        threshold: int = BREAKER_THRESHOLD,
+        base_delay: float = BREAKER_BASE_DELAY,
+        max_delay: float = BREAKER_MAX_DELAY,
+    ):
+        self.host = host
+        self.threshold = max(1, threshold)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.state = CLOSED
+        self.failures = 0  # gagal beruntun saat closed
+        self.open_streak = 0  # berapa kali open beruntun (pangkat backoff)
+        self.next_probe = 0.0
+        self.rejected = 0
+        self.opened_total = 0
+
+    # === Status ===
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() >= self.next_probe:
+            self._ganti_state(HALF_OPEN)
+            return True  # request ini jadi probe
+        self.rejected += 1
+        return False
+
+    def sisa_jeda(self) -> float:
+        return max(0.0, self.next_probe - time.monotonic())
+
+    @property
+    def is_probe(self) -> bool:
+        return self.state == HALF_OPEN
+
+    # === Hasil request ===
+    def record_success(self):
+        if self.state != CLOSED:
+            self._ganti_state(CLOSED)
+        self.failures = 0
+        self.open_streak = 0
+
+    def record_failure(self):
+        if self.state == HALF_OPEN:
+            self._buka()
+            return
+        self.failures += 1
+        if self.state == CLOSED and self.failures >= self.threshold:
+            self._buka()
+
+    def record_aborted(self):
+        """
+        Probe selesai tanpa hasil (dibatalkan, redirect loop, error lain):
+        kembali open dengan jadwal probe baru, tanpa menaikkan backoff.
+        """
+        if self.state == HALF_OPEN:
+            self._buka(naik=False)
+
+    def _buka(self, naik: bool = True):
+        streak = self.open_streak if naik else max(0, self.open_streak - 1)
+        jeda = min(self.max_delay, self.base_delay * (2**streak))
+        # jitter ±50% supaya probe tiap host/worker tidak barengan
+        jeda = random.uniform(jeda / 2, jeda * 1.5)
+        if naik:
+            self.open_streak += 1
+        self.opened_total += 1
+        self.next_probe = time.monotonic() + jeda
+        self._ganti_state(OPEN, f"probe dalam {jeda:.0f}s")
+
+    def _ganti_state(self, baru: str, catatan: str = ""):
+        lama, self.state = self.state, baru
+        log = logger.warning if baru == OPEN else logger.info
+        log(
+            "⚡ Circuit %s: %s → %s (gagal=%d)%s",
+            self.host,
+            lama,
+            baru,
+            self.failures,
+            f", {catatan}" if catatan else "",
+        )
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened_total": self.opened_total,
+            "rejected": self.rejected,
+            "next_probe_in": round(self.sisa_jeda()) if self.state == OPEN else 0,
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = CircuitBreaker(host)
+        _breakers[host] = breaker
+    return breaker
+
+
+def get_breaker_stats() -> dict:
+    """Status breaker per host untuk /fetchstats & log."""
+    return {host: b.snapshot() for host, b in _breakers.items()}
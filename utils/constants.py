@@ -22,4 +22,10 @@ LINK = os.path.join(DATA_DIR, "link.json")
 TOPIK_ID = os.path.join(DATA_DIR, "topik_ids.json")
 WHITELIST_LINK = os.path.join(DATA_DIR, "whitelist.json")
 BLACKLIST_LINK = os.path.join(DATA_DIR, "blacklist.json")
+PHISHING_CACHE_FILE = os.path.join(DATA_DIR, "cache_phishing_links.json")
 AUTOREPLY_FILE = os.path.join(DATA_DIR, "autoreply.json")
+FX_CACHE = os.path.join(DATA_DIR, "cache_kurs.json")
+FX_ALERT_FILE = os.path.join(DATA_DIR, "kurs_alert.json")
+FX_HISTORY_DIR = os.path.join(DATA_DIR, "fx_history")
+ARCHIVE_DB = os.path.join(DATA_DIR, "arsip.db")
+STATE_DB = os.path.join(DATA_DIR, "state.db")
@@ -0,0 +1,188 @@
+# utils/eps_parser.py
+import re
+from html.parser import HTMLParser
+
+# Semua baris data ada di dalam <table>, jadi navigasi sebelum tabel pertama
+# tidak perlu di-tokenize sama sekali. <script>/<style> dilompati supaya string
+# "<table" di dalam JS tidak dianggap awal tabel.
+_TABLE_START = re.compile(r"<(table|script|style)\b", re.IGNORECASE)
+
+
+class _Berhenti(Exception):
+    pass
+
+
+class _Row:
+    __slots__ = ("row_id", "cells", "table_depth", "has_td")
+
+    def __init__(self, row_id, table_depth):
+        self.row_id = row_id
+        self.cells = []
+        self.table_depth = table_depth
+        self.has_td = False
+
+
+class _Cell:
+    __slots__ = ("parts", "table_depth")
+
+    def __init__(self, table_depth):
+        self.parts = []
+        self.table_depth = table_depth
+
+
+class _TableRowParser(HTMLParser):
+    """
+    Parser event-driven untuk tabel hasil EPS. Meniru selector lama:
+      1) table.<table_class> tr[id^='<row_id_prefix>']
+      2) fallback: tr yang punya td di table.<table_class> pertama (atau table pertama)
+    Berhenti begitu `max_rows` baris ber-ID sudah terkumpul.
+    """
+
+    def __init__(self, max_rows: int, table_class: str, row_id_prefix: str):
+        super().__init__(convert_charrefs=True)
+        self.max_rows = max_rows
+        self.table_class = table_class
+        self.row_id_prefix = row_id_prefix
+        self.id_rows = []
+        self._tables = []  # stack: (is_table_type, index_tabel)
+        self._n_tables = 0
+        self._first_type_idx = None
+        self._rows_per_table = {}  # index_tabel -> baris yang punya td
+        self._open_rows = []  # stack _Row (dengan index tabel)
+        self._open_cells = []
+
+    # === helper ===
+    def _in_table_type(self) -> bool:
+        return any(is_type for is_type, _ in self._tables)
+
+    def _close_cell(self):
+        self._open_cells.pop()
+
+    def _close_row(self):
+        row, table_idx, is_id_row = self._open_rows.pop()
+        if row.has_td:
+            self._rows_per_table.setdefault(table_idx, []).append(row)
+        if is_id_row:
+            self.id_rows.append(row)
+            if len(self.id_rows) >= self.max_rows:
+                raise _Berhenti
+
+    # === event ===
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            classes = (dict(attrs).get("class") or "").split()
+            is_type = self.table_class in classes
+            idx = self._n_tables
+            self._n_tables += 1
+            if is_type and self._first_type_idx is None:
+                self._first_type_idx = idx
+            self._tables.append((is_type, idx))
+        elif tag == "tr" and self._tables:
+            depth = len(self._tables)
+            # <tr> baru di level tabel yang sama menutup baris sebelumnya
+            while self._open_rows and self._open_rows[-1][0].table_depth >= depth:
+                while (
+                    self._open_cells
+                    and self._open_cells[-1].table_depth >= depth
+                ):
+                    self._close_cell()
+                self._close_row()
+            row_id = dict(attrs).get("id") or ""
+            is_id_row = (
+                row_id.startswith(self.row_id_prefix) and self._in_table_type()
+            )
+            self._open_rows.append(
+                (_Row(row_id, depth), self._tables[-1][1], is_id_row)
+            )
+        elif tag in ("td", "th") and self._open_rows:
+            depth = len(self._tables)
+            while self._open_cells and self._open_cells[-1].table_depth >= depth:
+                self._close_cell()
+            if tag == "td":
+                cell = _Cell(depth)
+                # td ikut terhitung di semua baris yang sedang terbuka
+                for row, _, _ in self._open_rows:
+                    row.cells.append(cell)
+                    row.has_td = True
+                self._open_cells.append(cell)
+
+    def handle_endtag(self, tag):
+        depth = len(self._tables)
+        if tag == "td":
+            if self._open_cells and self._open_cells[-1].table_depth == depth:
+                self._close_cell()
+        elif tag == "tr":
+            while self._open_cells and self._open_cells[-1].table_depth >= depth:
+                self._close_cell()
+            if self._open_rows and self._open_rows[-1][0].table_depth == depth:
+                self._close_row()
+        elif tag == "table" and self._tables:
+            while self._open_cells and self._open_cells[-1].table_depth >= depth:
+                self._close_cell()
+            while self._open_rows and self._open_rows[-1][0].table_depth >= depth:
+                self._close_row()
+            self._tables.pop()
+
+    def handle_data(self, data):
+        if self._open_cells:
+            teks = data.strip()
+            if teks:
+                for cell in self._open_cells:
+                    cell.parts.append(teks)
+
+    # === hasil ===
+    def selesai(self):
+        while self._open_cells:
+            self._close_cell()
+        try:
+            while self._open_rows:
+                self._close_row()
+        except _Berhenti:
+            pass
+
+    def fallback_rows(self):
+        idx = self._first_type_idx if self._first_type_idx is not None else 0
+        return self._rows_per_table.get(idx, [])
+
+
+def _cari_awal_tabel(html_text: str):
+    pos = 0
+    while True:
+        m = _TABLE_START.search(html_text, pos)
+        if not m:
+            return None
+        tag = m.group(1).lower()
+        if tag == "table":
+            return m.start()
+        tutup = re.compile(rf"</{tag}\s*>", re.IGNORECASE).search(html_text, m.end())
+        if not tutup:
+            return None
+        pos = tutup.end()
+
+
+def parse_table_rows(
+    html_text: str,
+    max_rows: int = 10,
+    table_class: str = "tableType",
+    row_id_prefix: str = "tr_",
+) -> list[list[str]]:
+    """
+    Ambil maksimal `max_rows` baris tabel EPS sebagai list kolom (teks).
+    Tidak membangun tree DOM; parse berhenti setelah baris cukup.
+    """
+    if not html_text:
+        return []
+    start = _cari_awal_tabel(html_text)
+    if start is None:
+        return []
+
+    parser = _TableRowParser(max_rows, table_class, row_id_prefix)
+    try:
+        parser.feed(html_text[start:])
+        parser.close()
+        parser.selesai()
+    except _Berhenti:
+        pass
+
+    rows = parser.id_rows or parser.fallback_rows()
+    return [["".join(cell.parts) for cell in row.cells] for row in rows[:max_rows]]
@@ -0,0 +1,123 @@
+# utils/eps_pipeline.py
+import logging
+import time
+from html import escape
+
+from .circuit_breaker import CircuitOpenError
+from .eps_parser import parse_table_rows
+from .eps_sources import EPS_SOURCES, EpsSource
+from .parse_pool import run_parse
+from .http_client import baca_fallback, fetch_conditional, forget_validators
+from .json_store import baca_json, json_store, mtime_json
+from .prefetch import get_snapshot, register_source
+
+logger = logging.getLogger(__name__)
+
+
+# === Fetch + parse ===
+async def ambil_data(source: EpsSource):
+    """
+    Return (rows, segar). rows=None kalau halaman tidak berubah (304/hash sama),
+    [] kalau gagal. segar=False kalau isi diambil dari file HTML lokal.
+    """
+    try:
+        html_text, berubah = await fetch_conditional(
+            source.key, source.url, verify=False
+        )
+        segar = True
+    except CircuitOpenError as e:
+        logger.info("⚡ %s dilewati (%s), pakai fallback", source.nama, e)
+        html_text, berubah, segar = baca_fallback(source.fallback_file), True, False
+    except Exception:
+        logger.exception("Gagal ambil HTML %s (%s)", source.nama, source.url)
+        html_text, berubah, segar = baca_fallback(source.fallback_file), True, False
+
+    if not berubah:
+        return None, True  # 304 / hash sama → tidak perlu parse
+    if not html_text:
+        return [], segar
+
+    try:
+        # Parse di pool worker supaya moderasi tidak tertahan halaman besar
+        rows = await run_parse(
+            parse_table_rows,
+            html_text,
+            source.max_rows,
+            source.table_class,
+            source.row_id_prefix,
+        )
+    except Exception:
+        logger.error("Gagal parse data %s", source.nama, exc_info=True)
+        rows = []
+    n_kolom = len(source.fields)
+    data = [
+        dict(zip(source.fields, kolom)) for kolom in rows or [] if len(kolom) >= n_kolom
+    ]
+    if not data:
+        # Termasuk baris yang semuanya kurang kolom (layout berubah): lupakan
+        # validator supaya body yang sama tetap di-parse ulang di fetch berikutnya
+        logger.warning("⚠️ Tidak ada baris data %s ditemukan.", source.nama)
+        forget_validators(source.key)
+        return [], segar
+    return data, segar
+
+
+# === Cache ===
+def load_cache(source: EpsSource) -> list:
+    return (baca_json(source.cache_file) or {}).get(source.cache_key, [])
+
+
+async def simpan_cache(source: EpsSource, data: list):
+    await json_store.simpan(
+        source.cache_file, {source.cache_key: data}, indent=2, ensure_ascii=False
+    )
+
+
+def is_data_baru(source: EpsSource, data_baru: list, data_lama: list) -> bool:
+    key = lambda d: tuple(d.get(field, "") for field in source.fields)
+    return [key(d) for d in data_baru] != [key(d) for d in data_lama]
+
+
+# === Refresh (dipanggil prefetch) ===
+def _cache_mtime(source: EpsSource):
+    return mtime_json(source.cache_file)
+
+
+async def refresh(source: EpsSource):
+    """Return (data, fetched_at, segar) untuk utils.prefetch."""
+    data_baru, segar = await ambil_data(source)
+    if data_baru is None:
+        # Halaman tidak berubah: lewati parse & perbandingan
+        return get_snapshot(source.key) or load_cache(source), time.time(), True
+
+    data_lama = load_cache(source)
+    if not data_baru:
+        return data_lama, _cache_mtime(source), False
+    if is_data_baru(source, data_baru, data_lama):
+        await simpan_cache(source, data_baru)
+    return data_baru, time.time() if segar else _cache_mtime(source), segar
+
+
+# === Render ===
+def render(source: EpsSource, data: list, jumlah: int) -> str:
+    bagian = []
+    for idx, item in enumerate(data[:jumlah], start=1):
+        nilai = {field: escape(item.get(field, "-")) for field in source.fields}
+        bagian.append(source.template.format(idx=idx, url=source.url, **nilai))
+    return "".join(bagian).strip()
+
+
+def _make_refresher(source: EpsSource):
+    async def _refresh():
+        return await refresh(source)
+
+    return _refresh
+
+
+for _source in EPS_SOURCES.values():
+    register_source(
+        _source.key,
+        _make_refresher(_source),
+        fresh_ttl=_source.fresh_ttl,
+        stale_ttl=_source.stale_ttl,
+    )
@@ -0,0 +1,116 @@
+# utils/eps_sources.py
+"""
+Registry sumber data EPS-TOPIK (hrdkorea). Tiap feed cukup dideskripsikan di
+sini; fetch, parse, diff, simpan & render ditangani utils/eps_pipeline.py.
+"""
+from dataclasses import dataclass
+
+from .constants import EPS_FINAL, EPS_TAHAP1, JADWAL_EPS, JADWAL_REG_EPS
+
+LINK_SELENGKAPNYA = '<a href="{url}">🔗 Selengkapnya (klik di sini)</a>\n\n'
+
+
+@dataclass(frozen=True)
+class EpsSource:
+    key: str  # key prefetch/statistik, juga nama command
+    guard_key: str  # key di topik_ids.json
+    nama: str  # label untuk log & pesan error
+    url: str
+    fallback_file: str  # file HTML lokal kalau fetch gagal
+    cache_file: str
+    cache_key: str  # key list di file cache
+    fields: tuple  # nama field sesuai urutan kolom <td>
+    template: str  # format per item: {idx}, {url} & nama field
+    table_class: str = "tableType"
+    row_id_prefix: str = "tr_"
+    max_rows: int = 10
+    # Stale-while-revalidate (detik): segar → tanpa jaringan,
+    # basi → jawab dari cache + revalidasi background, lewat → tunggu fetch
+    fresh_ttl: int = 1800
+    stale_ttl: int = 6 * 3600
+
+    @property
+    def command(self) -> str:
+        return self.key
+
+
+EPS_SOURCES = {
+    src.key: src
+    for src in (
+        EpsSource(
+            key="jadwal",
+            guard_key="get_jadwal",
+            nama="jadwal",
+            url="https://epstopik.hrdkorea.or.kr/epstopik/abot/exam/sechduleGuideList.do?lang=en",
+            fallback_file="jadwal.html",
+            cache_file=JADWAL_EPS,
+            cache_key="jadwal",
+            fields=("nation", "title", "type", "announcement_date"),
+            template=(
+                "<b>{idx}. 📅 Jadwal Ujian EPS-TOPIK</b>\n\n"
+                "<b>📌 Judul:</b> {title}\n"
+                "<b>🧪 Jenis Ujian:</b> {type}\n"
+                "<b>🌍 Negara:</b> {nation}\n"
+                "<b>📢 Tanggal Pengumuman Jadwal:</b> {announcement_date}\n"
+                + LINK_SELENGKAPNYA
+            ),
+        ),
+        EpsSource(
+            key="reg",
+            guard_key="get_reg",
+            nama="pendaftaran",
+            url="https://epstopik.hrdkorea.or.kr/epstopik/abot/exam/selectSechduleDescList.do?lang=en",
+            fallback_file="reg.html",
+            cache_file=JADWAL_REG_EPS,
+            cache_key="pendaftaran",
+            fields=("type", "title", "nation", "period", "test_date", "result_date"),
+            template=(
+                "<b>{idx}. 📝 Pendaftaran EPS-TOPIK</b>\n\n"
+                "<b>📌 Judul:</b> {title}\n"
+                "<b>🧪 Jenis Ujian:</b> {type}\n"
+                "<b>🌍 Negara:</b> {nation}\n"
+                "<b>📅 Periode Daftar:</b> {period}\n"
+                "<b>🗓️ Jadwal Ujian:</b> {test_date}\n"
+                "<b>📢 Hasil:</b> {result_date}\n" + LINK_SELENGKAPNYA
+            ),
+        ),
+        EpsSource(
+            key="pass1",
+            guard_key="get_pass1",
+            nama="tahap 1",
+            url="https://epstopik.hrdkorea.or.kr/epstopik/pass/candidate/functionalLevelCandidateList.do?lang=en",
+            fallback_file="pass1.html",
+            cache_file=EPS_TAHAP1,
+            cache_key="tahap1",
+            fields=("nation", "title", "type", "date"),
+            fresh_ttl=900,
+            stale_ttl=3 * 3600,
+            template=(
+                "<b>{idx}. 🧾 Hasil Tahap 1 EPS-TOPIK</b>\n\n"
+                "<b>📌 Judul:</b> {title}\n"
+                "<b>🧪 Jenis Ujian:</b> {type}\n"
+                "<b>🌍 Negara:</b> {nation}\n"
+                "<b>📅 Diumumkan:</b> {date}\n" + LINK_SELENGKAPNYA
+            ),
+        ),
+        EpsSource(
+            key="pass2",
+            guard_key="get_pass2",
+            nama="tahap FINAL",
+            url="https://epstopik.hrdkorea.or.kr/epstopik/pass/candidate/sucessCandidateList.do?lang=en",
+            fallback_file="pass2.html",
+            cache_file=EPS_FINAL,
+            cache_key="final",
+            fields=("nation", "title", "type", "date"),
+            fresh_ttl=900,
+            stale_ttl=3 * 3600,
+            template=(
+                "<b>{idx}. 🏁 Hasil Akhir EPS-TOPIK</b>\n\n"
+                "<b>📌 Judul:</b> {title}\n"
+                "<b>🧪 Jenis Ujian:</b> {type}\n"
+                "<b>🌍 Negara:</b> {nation}\n"
+                "<b>📅 Diumumkan:</b> {date}\n" + LINK_SELENGKAPNYA
+            ),
+        ),
+    )
+}
@@ -0,0 +1,155 @@
+# utils/fx_alerts.py
+"""
+Langganan alert kurs (/kursalert). Threshold disimpan terurut per pasangan &
+arah, jadi tiap refresh kurs cukup bisect sekali per pasangan: O(log n + k)
+untuk k alert yang terpicu, tanpa memindai semua pelanggan.
+Alert sekali pakai: setelah terpicu langsung dihapus.
+"""
+import logging
+import time
+from bisect import bisect_left, bisect_right, insort
+
+from .batch_sender import BatchSender
+from .constants import FX_ALERT_FILE
+from .fx_rates import FX_KEY
+from .json_store import baca_json, json_store
+from .prefetch import add_listener
+
+logger = logging.getLogger(__name__)
+
+ATAS = "above"
+BAWAH = "below"
+MAX_ALERT_PER_USER = 5
+
+
+class AlertBook:
+    def __init__(self, path: str):
+        self.path = path
+        self._alerts: dict[int, dict] = {}  # id -> alert
+        # (dari, ke, arah) -> list terurut (nilai, id)
+        self._index: dict[tuple, list] = {}
+        self._next_id = 1
+        self._loaded = False
+
+    # === Persistensi ===
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        for alert in baca_json(self.path, []):
+            self._masukkan(alert)
+
+    def _simpan(self):
+        json_store.jadwalkan(self.path, list(self._alerts.values()), indent=2)
+
+    def _masukkan(self, alert: dict):
+        self._alerts[alert["id"]] = alert
+        daftar = self._index.setdefault(self._kunci(alert), [])
+        insort(daftar, (alert["nilai"], alert["id"]))
+        self._next_id = max(self._next_id, alert["id"] + 1)
+
+    @staticmethod
+    def _kunci(alert: dict) -> tuple:
+        return alert["dari"], alert["ke"], alert["arah"]
+
+    # === Operasi user ===
+    def tambah(self, user_id: int, dari: str, ke: str, arah: str, nilai: float) -> dict:
+        self._load()
+        if len(self.milik(user_id)) >= MAX_ALERT_PER_USER:
+            raise ValueError(f"Maksimal {MAX_ALERT_PER_USER} alert per user.")
+        alert = {
+            "id": self._next_id,
+            "user_id": user_id,
+            "dari": dari,
+            "ke": ke,
+            "arah": arah,
+            "nilai": nilai,
+            "dibuat": time.time(),
+        }
+        self._masukkan(alert)
+        self._simpan()
+        return alert
+
+    def hapus(self, user_id: int, alert_id: int) -> bool:
+        self._load()
+        alert = self._alerts.get(alert_id)
+        if alert is None or alert["user_id"] != user_id:
+            return False
+        self._buang([alert])
+        self._simpan()
+        return True
+
+    def milik(self, user_id: int) -> list[dict]:
+        self._load()
+        return [a for a in self._alerts.values() if a["user_id"] == user_id]
+
+    def pasangan(self) -> set[tuple]:
+        """Pasangan (dari, ke) yang punya pelanggan."""
+        self._load()
+        return {(kunci[0], kunci[1]) for kunci, isi in self._index.items() if isi}
+
+    # === Evaluasi saat refresh ===
+    def terpicu(self, dari: str, ke: str, rate: float) -> list[dict]:
+        """Ambil & hapus alert pasangan ini yang terpicu oleh `rate`."""
+        self._load()
+        hasil = []
+        atas = self._index.get((dari, ke, ATAS))
+        if atas:
+            # threshold <= rate = prefix list terurut
+            k = bisect_right(atas, (rate, float("inf")))
+            hasil += [self._alerts.pop(i) for _, i in atas[:k]]
+            del atas[:k]
+        bawah = self._index.get((dari, ke, BAWAH))
+        if bawah:
+            # threshold >= rate = suffix list terurut
+            k = bisect_left(bawah, (rate, -1))
+            hasil += [self._alerts.pop(i) for _, i in bawah[k:]]
+            del bawah[k:]
+        if hasil:
+            self._simpan()
+        return hasil
+
+    def _buang(self, alerts: list[dict]):
+        per_kunci: dict[tuple, set] = {}
+        for alert in alerts:
+            self._alerts.pop(alert["id"], None)
+            per_kunci.setdefault(self._kunci(alert), set()).add(alert["id"])
+        for kunci, ids in per_kunci.items():
+            self._index[kunci] = [e for e in self._index.get(kunci, []) if e[1] not in ids]
+
+
+alert_book = AlertBook(FX_ALERT_FILE)
+
+
+# === Hook refresh kurs ===
+def teks_alert(alert: dict, rate: float) -> str:
+    tanda = "≥" if alert["arah"] == ATAS else "≤"
+    return (
+        f"🔔 *Alert kurs #{alert['id']}*\n"
+        f"1 {alert['dari'].upper()} = {rate:,.6g} {alert['ke'].upper()}\n"
+        f"(target {tanda} {alert['nilai']:,.6g})"
+    )
+
+
+def setup_fx_alerts(app):
+    """Cek alert tiap snapshot kurs segar; notifikasi dikirim lewat BatchSender."""
+    sender = BatchSender(app.bot)
+
+    async def _on_refresh(key: str, data):
+        if key != FX_KEY or not isinstance(data, dict):
+            return
+        kirim = []
+        for dari, ke in alert_book.pasangan():
+            a, b = data.get(dari), data.get(ke)
+            if not (a and b):
+                continue
+            rate = b / a
+            kirim += [(alert, rate) for alert in alert_book.terpicu(dari, ke, rate)]
+        if not kirim:
+            return
+        logger.info("🔔 %d alert kurs terpicu", len(kirim))
+        for alert, rate in kirim:
+            sender.kirim(alert["user_id"], teks_alert(alert, rate), parse_mode="Markdown")
+
+    add_listener(_on_refresh)
+    return sender
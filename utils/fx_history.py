@@ -0,0 +1,143 @@
+# utils/fx_history.py
+"""
+Riwayat kurs per pasangan dalam file biner fixed-width (data/fx_history/<dari>_<ke>.bin).
+Tiap record = (epoch, rate) sebagai 2 x float64 little-endian, urut waktu, jadi:
+  - append O(1) (tulis 16 byte di akhir file)
+  - query rentang = binary search posisi awal lewat mmap, lalu baca jendelanya saja
+"""
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import time
+
+from .constants import FX_HISTORY_DIR
+from .fx_rates import FX_KEY
+from .prefetch import add_listener
+
+logger = logging.getLogger(__name__)
+
+RECORD = struct.Struct("<dd")
+# Pasangan yang dicatat; pasangan kebalikannya ikut terlayani (1/x)
+FX_HISTORY_PAIRS = [
+    tuple(p.strip().lower().split("/", 1))
+    for p in os.getenv("FX_HISTORY_PAIRS", "krw/idr,usd/idr,usd/krw,jpy/idr").split(",")
+    if "/" in p
+]
+PERIODE = (("1 hari", 86400), ("7 hari", 7 * 86400), ("30 hari", 30 * 86400))
+
+
+def _path(dari: str, ke: str) -> str:
+    return os.path.join(FX_HISTORY_DIR, f"{dari}_{ke}.bin")
+
+
+# === Tulis ===
+def append(dari: str, ke: str, ts: float, rate: float) -> bool:
+    """Tambah satu record di akhir file; dilewati kalau tidak lebih baru dari record terakhir."""
+    os.makedirs(FX_HISTORY_DIR, exist_ok=True)
+    path = _path(dari, ke)
+    with open(path, "ab+") as f:
+        ukuran = f.tell()
+        sisa = ukuran % RECORD.size
+        if sisa:
+            # record terakhir terpotong (mis. crash saat menulis): buang
+            ukuran -= sisa
+            f.truncate(ukuran)
+        if ukuran >= RECORD.size:
+            f.seek(ukuran - RECORD.size)
+            ts_akhir, _ = RECORD.unpack(f.read(RECORD.size))
+            if ts <= ts_akhir:
+                return False
+        f.seek(0, os.SEEK_END)
+        f.write(RECORD.pack(ts, rate))
+    return True
+
+
+def catat_snapshot(rates: dict, ts: float) -> int:
+    """Catat semua pasangan FX_HISTORY_PAIRS dari tabel kurs (base apa pun)."""
+    n = 0
+    for dari, ke in FX_HISTORY_PAIRS:
+        a, b = rates.get(dari), rates.get(ke)
+        if a and b and append(dari, ke, ts, b / a):
+            n += 1
+    return n
+
+
+# === Baca ===
+def _cari_awal(buf, n: int, ts: float) -> int:
+    """Index record pertama dengan waktu >= ts (binary search di mmap)."""
+    lo, hi = 0, n
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if RECORD.unpack_from(buf, mid * RECORD.size)[0] < ts:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _file_untuk(dari: str, ke: str):
+    """(path, invers) untuk pasangan ini atau kebalikannya; None kalau tidak dicatat."""
+    for path, invers in ((_path(dari, ke), False), (_path(ke, dari), True)):
+        if os.path.exists(path) and os.path.getsize(path) >= RECORD.size:
+            return path, invers
+    return None
+
+
+def statistik(dari: str, ke: str, detik: float, sekarang: float | None = None):
+    """min/max/rata-rata & % perubahan dalam `detik` terakhir; None kalau tidak ada data."""
+    lokasi = _file_untuk(dari.lower(), ke.lower())
+    if lokasi is None:
+        return None
+    path, invers = lokasi
+    sekarang = sekarang or time.time()
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        n = len(buf) // RECORD.size
+        awal = _cari_awal(buf, n, sekarang - detik)
+        if awal >= n:
+            return None
+        mn, mx, total, pertama, terakhir = float("inf"), 0.0, 0.0, None, None
+        for i in range(awal, n):
+            rate = RECORD.unpack_from(buf, i * RECORD.size)[1]
+            if invers:
+                rate = 1.0 / rate
+            mn, mx, total = min(mn, rate), max(mx, rate), total + rate
+            pertama = rate if pertama is None else pertama
+            terakhir = rate
+        jumlah = n - awal
+
+    return {
+        "n": jumlah,
+        "min": mn,
+        "max": mx,
+        "avg": total / jumlah,
+        "awal": pertama,
+        "akhir": terakhir,
+        "perubahan": (terakhir - pertama) / pertama * 100 if pertama else 0.0,
+    }
+
+
+def ringkasan_tren(dari: str, ke: str) -> list[tuple[str, dict]]:
+    """[(label periode, statistik)] untuk periode yang ada datanya."""
+    hasil = []
+    for label, detik in PERIODE:
+        stat = statistik(dari, ke, detik)
+        if stat and stat["n"] > 1:
+            hasil.append((label, stat))
+    return hasil
+
+
+# === Hook refresh kurs ===
+async def _on_refresh(key: str, data):
+    if key != FX_KEY or not isinstance(data, dict):
+        return
+    n = await asyncio.to_thread(catat_snapshot, data, time.time())
+    if n:
+        logger.info("📈 Riwayat kurs: %d pasangan dicatat", n)
+
+
+def setup_fx_history():
+    """Catat tiap snapshot kurs segar ke riwayat."""
+    add_listener(_on_refresh)
@@ -0,0 +1,195 @@
+# utils/fx_providers.py
+"""
+Beberapa penyedia kurs dengan hedged request: provider utama dicoba dulu,
+kalau belum menjawab dalam persentil latensinya (default p90), provider
+cadangan ikut ditembak. Jawaban valid pertama yang lolos cek kewajaran
+(dibanding snapshot terakhir) dipakai, sisanya dibatalkan.
+"""
+import asyncio
+import logging
+import os
+import statistics
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Callable
+
+from .http_client import fetch_json
+
+logger = logging.getLogger(__name__)
+
+HEDGE_PERSENTIL = float(os.getenv("FX_HEDGE_PERCENTILE", "90"))
+HEDGE_MIN = float(os.getenv("FX_HEDGE_MIN", "0.3"))  # detik
+HEDGE_MAX = float(os.getenv("FX_HEDGE_MAX", "3.0"))
+HEDGE_AWAL = 1.0  # jeda hedge selama sampel latensi belum cukup
+MIN_SAMPEL = 5
+# Median selisih relatif terhadap snapshot lama yang masih dianggap wajar
+TOLERANSI = float(os.getenv("FX_SANITY_TOLERANCE", "0.1"))
+MIN_MATA_UANG = 10
+
+
+# === Parser per provider → {kode: jumlah mata uang per 1 base} ===
+def _normalisasi(base: str, mapping: dict) -> dict[str, float]:
+    rates = {base: 1.0}
+    for kode, nilai in (mapping or {}).items():
+        try:
+            rate = float(nilai["rate"] if isinstance(nilai, dict) else nilai)
+        except (KeyError, TypeError, ValueError):
+            continue
+        if rate > 0:
+            rates[kode.lower()] = rate
+    rates[base] = 1.0
+    return rates
+
+
+def parse_floatrates(base: str, payload: dict) -> dict[str, float]:
+    return _normalisasi(base, payload)
+
+
+def parse_erapi(base: str, payload: dict) -> dict[str, float]:
+    if (payload or {}).get("result") != "success":
+        return {}
+    return _normalisasi(base, payload.get("rates"))
+
+
+def parse_currency_api(base: str, payload: dict) -> dict[str, float]:
+    return _normalisasi(base, (payload or {}).get(base))
+
+
+@dataclass(frozen=True)
+class FxProvider:
+    nama: str
+    url: str  # {base} huruf kecil, {BASE} huruf besar
+    parse: Callable[[str, dict], dict]
+
+    def url_untuk(self, base: str) -> str:
+        return self.url.format(base=base.lower(), BASE=base.upper())
+
+
+PROVIDERS = {
+    p.nama: p
+    for p in (
+        FxProvider(
+            "floatrates",
+            "https://www.floatrates.com/daily/{base}.json",
+            parse_floatrates,
+        ),
+        FxProvider(
+            "erapi",
+            "https://open.er-api.com/v6/latest/{BASE}",
+            parse_erapi,
+        ),
+        FxProvider(
+            "currency-api",
+            "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/{base}.json",
+            parse_currency_api,
+        ),
+    )
+}
+# Urutan prioritas; yang pertama = provider utama
+URUTAN = [
+    n.strip()
+    for n in os.getenv("FX_PROVIDERS", "floatrates,erapi,currency-api").split(",")
+    if n.strip() in PROVIDERS
+] or list(PROVIDERS)
+
+# Latensi sukses terakhir per provider & statistik menang/gagal/ditolak
+_latensi: dict[str, deque] = defaultdict(lambda: deque(maxlen=50))
+_stats: dict[str, dict] = defaultdict(
+    lambda: {"request": 0, "menang": 0, "gagal": 0, "ditolak": 0}
+)
+
+
+def jeda_hedge(nama: str) -> float:
+    """Persentil latensi provider ini (detik), dibatasi HEDGE_MIN..HEDGE_MAX."""
+    sampel = _latensi[nama]
+    if len(sampel) < MIN_SAMPEL:
+        return HEDGE_AWAL
+    titik = statistics.quantiles(sampel, n=100, method="inclusive")
+    indeks = min(98, max(0, int(HEDGE_PERSENTIL) - 1))
+    return min(HEDGE_MAX, max(HEDGE_MIN, titik[indeks]))
+
+
+# === Cek kewajaran ===
+def wajar(baru: dict, lama: dict | None) -> bool:
+    """Tolak tabel yang terlalu sedikit isinya atau menyimpang jauh dari snapshot lama."""
+    if len(baru) < MIN_MATA_UANG:
+        return False
+    if not lama:
+        return True
+    if len(baru) < len(lama) // 2:
+        return False
+    selisih = [abs(baru[k] / lama[k] - 1) for k in baru.keys() & lama.keys() if lama[k] > 0]
+    if len(selisih) < MIN_MATA_UANG:
+        return False
+    # Median: satu-dua mata uang yang bergejolak tidak menggagalkan seluruh tabel
+    return statistics.median(selisih) <= TOLERANSI
+
+
+async def _coba(provider: FxProvider, base: str, lama: dict | None):
+    stat = _stats[provider.nama]
+    stat["request"] += 1
+    mulai = time.monotonic()
+    try:
+        payload = await fetch_json(provider.url_untuk(base))
+        rates = provider.parse(base, payload)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        stat["gagal"] += 1
+        logger.warning("Gagal fetch kurs dari %s: %r", provider.nama, e)
+        return None
+    _latensi[provider.nama].append(time.monotonic() - mulai)
+    if not wajar(rates, lama):
+        stat["ditolak"] += 1
+        logger.warning(
+            "Kurs dari %s ditolak cek kewajaran (%d mata uang)", provider.nama, len(rates)
+        )
+        return None
+    return rates
+
+
+async def ambil_kurs(base: str, lama: dict | None = None, providers=None):
+    """
+    Return (rates, nama_provider); ({}, None) kalau semua provider gagal.
+    Provider berikutnya dimulai saat yang terakhir gagal atau belum menjawab
+    dalam jeda_hedge-nya.
+    """
+    antre = list(providers or (PROVIDERS[n] for n in URUTAN))
+    berjalan: dict[asyncio.Task, FxProvider] = {}
+
+    def mulai_berikutnya():
+        provider = antre.pop(0)
+        berjalan[asyncio.create_task(_coba(provider, base, lama))] = provider
+        return provider
+
+    terakhir = mulai_berikutnya()
+    try:
+        while berjalan:
+            timeout = jeda_hedge(terakhir.nama) if antre else None
+            selesai, _ = await asyncio.wait(
+                berjalan, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not selesai:
+                logger.info("⏱️ %s lambat, hedge ke %s", terakhir.nama, antre[0].nama)
+                terakhir = mulai_berikutnya()
+                continue
+            for task in selesai:
+                provider = berjalan.pop(task)
+                rates = task.result()
+                if rates:
+                    _stats[provider.nama]["menang"] += 1
+                    return rates, provider.nama
+            if antre:
+                terakhir = mulai_berikutnya()
+    finally:
+        for task in berjalan:
+            task.cancel()
+    return {}, None
+
+
+def get_provider_stats() -> dict:
+    return {
+        nama: {**_stats[nama], "hedge_ms": round(jeda_hedge(nama) * 1000)}
+        for nama in _stats
+    }
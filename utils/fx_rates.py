@@ -0,0 +1,138 @@
+# utils/fx_rates.py
+"""
+Tabel kurs di memori (base FX_BASE) dari beberapa provider dengan hedged
+request (utils/fx_providers.py). Semua pasangan dihitung sebagai cross-rate
+dari tabel ini, jadi command /kurs tidak perlu fetch ke jaringan. Refresh dijadwalkan lewat utils/prefetch (key "kurs").
+Matriks cross-rate N x N dibangun ulang hanya saat versi data kurs berubah.
+"""
+import logging
+import os
+import time
+from array import array
+
+from .constants import FX_CACHE
+from .fx_providers import ambil_kurs
+from .json_store import baca_json, json_store, mtime_json
+from .prefetch import data_version, get_snapshot, read_or_refresh, register_source
+
+logger = logging.getLogger(__name__)
+
+FX_KEY = "kurs"
+FX_BASE = os.getenv("FX_BASE", "usd").strip().lower()
+
+
+# === Fetch & cache ===
+def load_cache_kurs() -> dict:
+    data = baca_json(FX_CACHE) or {}
+    # Cache dari base lain (FX_BASE diganti) tidak bisa dipakai
+    if data.get("base", FX_BASE) == FX_BASE:
+        return data.get("rates", {})
+    return {}
+
+
+async def simpan_cache_kurs(rates: dict):
+    await json_store.simpan(FX_CACHE, {"base": FX_BASE, "rates": rates}, indent=2)
+
+
+async def refresh_kurs():
+    """Return (rates, fetched_at, segar) untuk utils.prefetch."""
+    # Snapshot terakhir jadi pembanding cek kewajaran hasil provider
+    lama = get_snapshot(FX_KEY) or load_cache_kurs()
+    rates, provider = await ambil_kurs(FX_BASE, lama)
+
+    if not rates:
+        logger.error("Semua provider kurs gagal, pakai cache")
+        return load_cache_kurs(), mtime_json(FX_CACHE), False
+
+    await simpan_cache_kurs(rates)
+    logger.info(
+        "[✅ KURS] %d mata uang (base %s) dari %s", len(rates), FX_BASE.upper(), provider
+    )
+    return rates, time.time(), True
+
+
+register_source(FX_KEY, refresh_kurs, fresh_ttl=1800, stale_ttl=24 * 3600)
+
+
+# === Matriks cross-rate ===
+class RateMatrix:
+    """
+    Matriks cross-rate datar (array double, row-major): m[i*n + j] = 1 kode[i]
+    dalam kode[j]. Konversi banyak nominal ke banyak mata uang cukup
+    ambil satu baris lalu kalikan, tanpa hitung ulang pembagian per request.
+    """
+
+    __slots__ = ("codes", "index", "n", "_m")
+
+    def __init__(self, rates: dict[str, float]):
+        self.codes = sorted(rates)
+        self.index = {kode: i for i, kode in enumerate(self.codes)}
+        self.n = len(self.codes)
+        nilai = [rates[kode] for kode in self.codes]
+        self._m = array("d")
+        for a in nilai:
+            inv = 1.0 / a
+            self._m.extend(b * inv for b in nilai)
+
+    def __contains__(self, kode: str) -> bool:
+        return kode.lower() in self.index
+
+    def rate(self, dari: str, ke: str):
+        i = self.index.get(dari.lower())
+        j = self.index.get(ke.lower())
+        if i is None or j is None:
+            return None
+        return self._m[i * self.n + j]
+
+    def konversi(self, jumlah: list[float], dari: str, ke: list[str]):
+        """
+        Return list baris per nominal: [[nilai di ke[0], ke[1], ...], ...].
+        None kalau ada kode yang tidak dikenal.
+        """
+        i = self.index.get(dari.lower())
+        kolom = [self.index.get(k.lower()) for k in ke]
+        if i is None or None in kolom:
+            return None
+        baris = self._m[i * self.n : (i + 1) * self.n]
+        faktor = [baris[j] for j in kolom]
+        return [[x * f for f in faktor] for x in jumlah]
+
+
+_matrix: RateMatrix | None = None
+_matrix_version = -1
+
+
+def get_matrix():
+    """Matriks untuk snapshot kurs terakhir; dibangun ulang kalau versinya berubah."""
+    global _matrix, _matrix_version
+    versi = data_version(FX_KEY)
+    if _matrix is None or versi != _matrix_version:
+        rates = get_snapshot(FX_KEY)
+        if not rates:
+            return None
+        mulai = time.perf_counter()
+        _matrix, _matrix_version = RateMatrix(rates), versi
+        logger.info(
+            "🧮 Matriks kurs %dx%d dibangun (%.1f ms)",
+            _matrix.n,
+            _matrix.n,
+            (time.perf_counter() - mulai) * 1000,
+        )
+    return _matrix
+
+
+async def matrix_siap():
+    """Matriks kurs untuk handler; fetch hanya kalau snapshot masih kosong/kedaluwarsa."""
+    await read_or_refresh(FX_KEY)
+    return get_matrix()
+
+
+def format_kurs(nilai: float) -> str:
+    """Angka kurs untuk pesan: 2 desimal kalau besar, digit bermakna kalau kecil."""
+    if nilai == 0:
+        return "0"
+    if abs(nilai) >= 100:
+        return f"{nilai:,.2f}"
+    if abs(nilai) >= 1:
+        return f"{nilai:,.4f}".rstrip("0").rstrip(".")
+    return f"{nilai:.6g}"
@@ -0,0 +1,202 @@
+# utils/http_client.py
+import asyncio
+import hashlib
+import logging
+import os
+from collections import defaultdict
+from urllib.parse import urlparse
+
+import httpx
+
+from .circuit_breaker import CircuitOpenError, get_breaker
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0"
+TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+MAX_CONNECTIONS = 10
+MAX_KEEPALIVE = 5
+MAX_PER_HOST = 2  # maksimum request paralel ke satu host
+RETRIES = 2
+RETRY_BACKOFF = 0.5  # detik, dikali 2 tiap percobaan
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Satu client per mode verifikasi TLS (hrdkorea butuh verify=False seperti curl -k)
+_clients: dict[bool, httpx.AsyncClient] = {}
+_host_limits: dict[str, asyncio.Semaphore] = {}
+
+# Validator per sumber: {"etag", "last_modified", "hash"}
+_validators: dict[str, dict] = {}
+# Statistik per sumber: request, not_modified (304), hash_hit, parsed
+_stats: dict[str, dict] = defaultdict(
+    lambda: {"request": 0, "not_modified": 0, "hash_hit": 0, "parsed": 0}
+)
+
+
+def _get_client(verify: bool) -> httpx.AsyncClient:
+    client = _clients.get(verify)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+            ),
+            follow_redirects=True,
+            verify=verify,
+        )
+        _clients[verify] = client
+    return client
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    host = urlparse(url).netloc
+    sem = _host_limits.get(host)
+    if sem is None:
+        sem = asyncio.Semaphore(MAX_PER_HOST)
+        _host_limits[host] = sem
+    return sem
+
+
+async def fetch(url: str, *, verify: bool = True, headers: dict | None = None):
+    """
+    GET dengan pool keep-alive, batas per host, timeout & retry.
+    Dibungkus circuit breaker per host: kalau host sedang down, langsung
+    raise CircuitOpenError tanpa menunggu timeout.
+    """
+    host = urlparse(url).netloc
+    breaker = get_breaker(host)
+    if not breaker.allow():
+        raise CircuitOpenError(host, breaker.sisa_jeda())
+    probe = breaker.is_probe
+    try:
+        # Probe half-open cukup sekali jalan, tanpa retry
+        resp = await _fetch_retry(url, verify, headers, 0 if probe else RETRIES)
+    except httpx.HTTPStatusError as e:
+        # 4xx berarti host hidup; hanya 5xx/429 yang dihitung gagal
+        if e.response.status_code in RETRY_STATUS:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        raise
+    except httpx.TransportError:
+        breaker.record_failure()
+        raise
+    except BaseException:
+        # Hasil probe tidak tercatat (CancelledError dari hedge yang kalah,
+        # TooManyRedirects, dll.): jangan biarkan breaker macet di half_open
+        if probe:
+            breaker.record_aborted()
+        raise
+    breaker.record_success()
+    return resp
+
+
+async def _fetch_retry(url: str, verify: bool, headers: dict | None, retries: int):
+    client = _get_client(verify)
+    last_error = None
+    for percobaan in range(retries + 1):
+        if percobaan:
+            await asyncio.sleep(RETRY_BACKOFF * (2 ** (percobaan - 1)))
+        try:
+            async with _host_semaphore(url):
+                resp = await client.get(url, headers=headers)
+            if resp.status_code in RETRY_STATUS and percobaan < retries:
+                logger.warning("HTTP %s dari %s, coba lagi", resp.status_code, url)
+                continue
+            if resp.status_code != 304:  # 304 = hasil conditional request
+                resp.raise_for_status()
+            return resp
+        except httpx.HTTPStatusError:
+            raise
+        except httpx.TransportError as e:
+            last_error = e
+            logger.warning(
+                "Gagal fetch %s (percobaan %d/%d): %r",
+                url,
+                percobaan + 1,
+                retries + 1,
+                e,
+            )
+    raise last_error
+
+
+async def fetch_text(url: str, *, verify: bool = True) -> str:
+    resp = await fetch(url, verify=verify)
+    return resp.text
+
+
+async def fetch_json(url: str, *, verify: bool = True):
+    resp = await fetch(url, verify=verify)
+    return resp.json()
+
+
+def baca_fallback(fallback_filename: str) -> str:
+    # fallback ke file lokal jika ada (cari di root lalu data/)
+    for local_path in (fallback_filename, os.path.join("data", fallback_filename)):
+        if os.path.exists(local_path):
+            try:
+                with open(local_path, "r", encoding="utf-8") as f:
+                    return f.read()
+            except Exception:
+                logger.exception("Gagal baca fallback %s", local_path)
+    return ""
+
+
+# === Conditional request (ETag/Last-Modified + hash body) ===
+async def fetch_conditional(source: str, url: str, *, verify: bool = True):
+    """
+    Return (text, berubah). Kalau server balas 304 atau hash body sama dengan
+    fetch sebelumnya, text=None & berubah=False → pemanggil boleh skip parse.
+    """
+    stat = _stats[source]
+    stat["request"] += 1
+    lama = _validators.get(source, {})
+    headers = {}
+    if lama.get("etag"):
+        headers["If-None-Match"] = lama["etag"]
+    if lama.get("last_modified"):
+        headers["If-Modified-Since"] = lama["last_modified"]
+
+    resp = await fetch(url, verify=verify, headers=headers or None)
+    if resp.status_code == 304:
+        stat["not_modified"] += 1
+        return None, False
+
+    digest = hashlib.sha1(resp.content).hexdigest()
+    _validators[source] = {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "hash": digest,
+    }
+    if digest == lama.get("hash"):
+        stat["hash_hit"] += 1
+        return None, False
+
+    stat["parsed"] += 1
+    return resp.text, True
+
+
+def forget_validators(source: str):
+    """Lupakan validator (mis. parse gagal) supaya fetch berikutnya parse ulang."""
+    _validators.pop(source, None)
+
+
+def get_fetch_stats() -> dict:
+    """Statistik conditional fetch per sumber + hit rate (parse yang dihindari)."""
+    hasil = {}
+    for source, stat in _stats.items():
+        dihindari = stat["not_modified"] + stat["hash_hit"]
+        hasil[source] = {
+            **stat,
+            "hit_rate": dihindari / stat["request"] if stat["request"] else 0.0,
+        }
+    return hasil
+
+
+async def close_http_client(*_):
+    """Tutup semua client (dipanggil saat bot shutdown)."""
+    for client in list(_clients.values()):
+        await client.aclose()
+    _clients.clear()
@@ -0,0 +1,207 @@
+# utils/json_store.py
+"""
+Satu jalur tulis untuk semua file data/*.json:
+  - atomik: tulis ke file temp di folder yang sama, fsync, lalu os.replace,
+    jadi file tidak pernah setengah tertulis walau bot mati di tengah jalan
+  - lock per file: asyncio.Lock antar handler + threading.Lock untuk penulis
+    dari worker thread, jadi penulisan tidak saling tumpang tindih
+  - I/O disk di-offload ke thread pool (asyncio.to_thread)
+  - debounce opsional: beberapa perubahan beruntun cukup ditulis sekali
+Pemanggil sinkron (kode lama) cukup pakai `jadwalkan`; di luar event loop
+(mis. di worker thread) otomatis jatuh ke tulis sinkron yang tetap atomik.
+Dengan STATE_BACKEND=sqlite, baca/tulis diteruskan ke utils/state_db.py.
+"""
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from .state_db import IMPOR_ULANG, state_db
+
+logger = logging.getLogger(__name__)
+
+
+def tulis_atomik(path: str, teks: str):
+    """Tulis `teks` ke `path` lewat temp + fsync + rename."""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(teks)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def baca_json(path: str, default=None):
+    """Isi file JSON; `default` kalau file tidak ada atau rusak."""
+    if state_db is not None:
+        if path in IMPOR_ULANG:
+            state_db.impor_kalau_baru(path)
+        data = state_db.baca_dokumen(path)
+        if data is not None:
+            return data
+        # belum dimigrasi ke DB: baca file lama
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError):
+        logger.warning("Gagal baca %s, pakai default", path, exc_info=True)
+        return default
+
+
+def mtime_json(path: str):
+    """Waktu terakhir ditulis (epoch) atau None kalau belum ada."""
+    if state_db is not None:
+        mtime = state_db.mtime(path)
+        if mtime is not None:
+            return mtime
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+class JsonStore:
+    def __init__(self):
+        self._async_locks: dict[str, asyncio.Lock] = {}
+        self._thread_locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+        # Debounce: path -> (data, kwargs dump) terbaru & timer-nya
+        self._pending: dict[str, tuple] = {}
+        self._timers: dict[str, asyncio.Task] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    # === Lock ===
+    def _async_lock(self, path: str) -> asyncio.Lock:
+        lock = self._async_locks.get(path)
+        if lock is None:
+            lock = self._async_locks[path] = asyncio.Lock()
+        return lock
+
+    def _thread_lock(self, path: str) -> threading.Lock:
+        with self._guard:
+            lock = self._thread_locks.get(path)
+            if lock is None:
+                lock = self._thread_locks[path] = threading.Lock()
+            return lock
+
+    def _tulis_terkunci(self, path: str, teks: str):
+        with self._thread_lock(path):
+            if state_db is not None:
+                state_db.tulis_dokumen(path, json.loads(teks))
+            else:
+                tulis_atomik(path, teks)
+
+    @staticmethod
+    def _dump(data, kwargs: dict) -> str:
+        return json.dumps(data, **kwargs)
+
+    # === Tulis ===
+    async def simpan(self, path: str, data, *, debounce: float = 0.0, **dump_kwargs):
+        """
+        Simpan `data` sebagai JSON (kwargs diteruskan ke json.dumps).
+        debounce > 0: tunda, dan kalau ada simpan lain ke path yang sama
+        sebelum waktunya, hanya data terakhir yang ditulis.
+        """
+        if debounce > 0:
+            self._tunda_simpan(path, data, debounce, dump_kwargs)
+            return
+        # Tulis langsung = versi terbaru; batalkan tulis tertunda yang lebih lama
+        self._batalkan_tunda(path)
+        await self._tulis(path, self._dump(data, dump_kwargs))
+
+    def _tunda_simpan(self, path: str, data, jeda: float, dump_kwargs: dict):
+        self._pending[path] = (data, dump_kwargs)
+        if path not in self._timers:
+            task = self._timers[path] = asyncio.create_task(self._tunda(path, jeda))
+            self._tasks.add(task)
+            task.add_done_callback(self._selesai)
+
+    async def _tulis(self, path: str, teks: str):
+        async with self._async_lock(path):
+            await asyncio.to_thread(self._tulis_terkunci, path, teks)
+
+    async def _tunda(self, path: str, jeda: float):
+        try:
+            await asyncio.sleep(jeda)
+        finally:
+            # jangan menghapus timer baru yang dibuat setelah timer ini dibatalkan
+            if self._timers.get(path) is asyncio.current_task():
+                del self._timers[path]
+        await self._tulis_pending(path)
+
+    async def _tulis_pending(self, path: str):
+        item = self._pending.pop(path, None)
+        if item is not None:
+            data, kwargs = item
+            await self._tulis(path, self._dump(data, kwargs))
+
+    def _batalkan_tunda(self, path: str):
+        self._pending.pop(path, None)
+        timer = self._timers.pop(path, None)
+        if timer is not None:
+            timer.cancel()
+
+    def simpan_sync(self, path: str, data, **dump_kwargs):
+        """Versi blocking (startup, worker thread). Tetap atomik & terkunci per file."""
+        self._tulis_terkunci(path, self._dump(data, dump_kwargs))
+
+    def jadwalkan(self, path: str, data, *, debounce: float = 0.0, **dump_kwargs):
+        """
+        Untuk pemanggil sinkron: di event loop, penulisan dijadwalkan di
+        background (data diserialisasi sekarang kecuali di-debounce); di luar
+        event loop langsung tulis sinkron.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.simpan_sync(path, data, **dump_kwargs)
+            return
+        if debounce > 0:
+            self._tunda_simpan(path, data, debounce, dump_kwargs)
+            return
+        self._batalkan_tunda(path)
+        task = asyncio.create_task(self._tulis(path, self._dump(data, dump_kwargs)))
+        self._tasks.add(task)
+        task.add_done_callback(self._selesai)
+
+    def _selesai(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Gagal menyimpan JSON", exc_info=task.exception())
+
+    async def perbarui(self, path: str, fn, default=None, **dump_kwargs):
+        """Baca-ubah-tulis di bawah lock file: data = fn(data lama). Return data baru."""
+        async with self._async_lock(path):
+            lama = await asyncio.to_thread(baca_json, path, default)
+            baru = fn(lama)
+            await asyncio.to_thread(self._tulis_terkunci, path, self._dump(baru, dump_kwargs))
+        return baru
+
+    async def flush(self):
+        """Tulis semua yang masih tertunda (dipanggil saat shutdown)."""
+        for path in list(self._timers):
+            timer = self._timers.pop(path)
+            timer.cancel()
+            await self._tulis_pending(path)
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+
+json_store = JsonStore()
+
+
+async def flush_json_store(*_):
+    await json_store.flush()
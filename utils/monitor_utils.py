@@ -1,12 +1,12 @@
 # monitor_utils.py
-import requests
 import html
-import json
-import os
 import logging
 from bs4 import BeautifulSoup
 from datetime import datetime, time
 from urllib.parse import urlparse, unquote
+from .http_client import fetch_json
+from .json_store import baca_json, json_store
+from .parse_pool import run_parse
 
 logger = logging.getLogger(__name__)
 
@@ -62,92 +62,100 @@ def format_pesan(item, tipe="pengumuman"):
     id_ = item.get("id", "-")
 
     return (
-        f"🆕 <b>{judul}</b>\n\n"
+        f"🆕 <b>{escape(str(judul))}</b>\n\n"
         f"🆔 ID: <code>{id_}</code>\n"
-        f"✍️ Creator: {creator}\n"
-        f"📅 Tanggal: {tanggal}\n"
+        f"✍️ Creator: {escape(str(creator))}\n"
+        f"📅 Tanggal: {escape(str(tanggal))}\n"
         f"👁️ View: {view}\n"
-        f"🏷️ Kategori: {kategori}\n"
+        f"🏷️ Kategori: {escape(str(kategori))}\n"
         f'🔗 Link: <a href="{escape(link)}">Klik di sini</a>'
     )
 
 
 # === CACHE UTILITAS ===
 def load_last_ids(cache_file, n=10):
-    if os.path.exists(cache_file):
-        with open(cache_file, "r", encoding="utf-8") as f:
-            return json.load(f).get("last_ids", [])[:n]
-    return []
+    return (baca_json(cache_file) or {}).get("last_ids", [])[:n]
 
 
 def save_last_ids(cache_file, ids, n=10):
-    with open(cache_file, "w", encoding="utf-8") as f:
-        json.dump({"last_ids": ids[:n]}, f, indent=2)
+    json_store.jadwalkan(cache_file, {"last_ids": ids[:n]}, indent=2)
+
+
+# === DIFF ID / ROW KEY ===
+def cari_item_baru(items, cache_file, key_fn, tipe="pengumuman", n=10, simpan=True):
+    """
+    Bandingkan key item dengan last_ids di cache_file.
+    Return item baru (urut lama → baru). Run pertama (cache belum ada) hanya
+    mengisi cache supaya tidak mengirim ulang semua item lama.
+    simpan=False: item baru belum ditandai; pemanggil memanggil
+    simpan_terkirim setelah pesannya benar-benar terkirim.
+    """
+    items = items[:n]
+    if not items:
+        logger.warning(f"🔍 Tidak ada data {tipe}.")
+        return []
+
+    cache = baca_json(cache_file)
+    pertama = cache is None
+    cached_ids = (cache or {}).get("last_ids", [])[:n]
+    baru = [item for item in items if key_fn(item) not in cached_ids]
+
+    logger.info(
+        f"📊 Statistik {tipe}: total {len(items)}, baru {len(baru)}, "
+        f"lama {len(items) - len(baru)}"
+    )
+
+    if (baru and simpan) or pertama:
+        all_ids = [key_fn(item) for item in items]
+        save_last_ids(cache_file, all_ids, n)
+        logger.info(f"💾 Cache {tipe} diperbarui. ID terakhir disimpan: {all_ids}")
+
+    if pertama:
+        logger.info(f"🌱 Cache {tipe} baru dibuat, notifikasi dilewati.")
+        return []
+    return list(reversed(baru))
+
+
+def simpan_terkirim(items, cache_file, key_fn, baru, terkirim, n=10):
+    """
+    Simpan last_ids = item lama + item baru yang sudah terkirim. Item baru
+    yang gagal terkirim tidak ditandai, jadi dicoba lagi di refresh berikutnya.
+    """
+    id_baru = {key_fn(item) for item in baru}
+    ids = [key_fn(item) for item in items[:n]]
+    save_last_ids(cache_file, [i for i in ids if i not in id_baru or i in terkirim], n)
 
 
 # === CEK API ===
+def _bersihkan_item(item):
+    judul, link = parse_judul_link(item.get("judul", ""))
+    return {
+        "id": item.get("id"),
+        "judul": judul,
+        "link": link,
+        "tanggal": item.get("tanggal", "-"),
+        "creator": item.get("creator", "-"),
+        "view": item.get("view", "-"),
+        "kategori": item.get("kategori", "-"),
+    }
+
 
+def _bersihkan_items(items):
+    return [_bersihkan_item(item) for item in items]
 
-def check_api_multi(api_url, cache_file, tipe="pengumuman"):
+
+async def check_api_multi(api_url, cache_file, tipe="pengumuman"):
     try:
         logger.info(
             f"🚀 Memulai pengecekan {tipe.upper()} dari API: {mask_api_url(api_url)}"
         )
 
-        response = requests.get(api_url)
-        response.raise_for_status()
-        data = response.json().get("data", [])[:10]
-
-        logger.debug(
-            f"📥 Data {tipe} dari API: {json.dumps(data, indent=2, ensure_ascii=False)}"
-        )
+        response = await fetch_json(api_url)
+        data = response.get("data", [])[:10]
 
-        if not data:
-            logger.warning(f"🔍 Tidak ada data {tipe} dari API.")
-            return []
-
-        cached_ids = load_last_ids(cache_file)
-        logger.info("🗂️  Cached IDs saat ini: %s", cached_ids)
-
-        baru = []
-
-        for item in data:
-            id_baru = item.get("id")
-            if id_baru not in cached_ids:
-                logger.info(f"🆕 ID baru ditemukan: {id_baru}")
-                judul_html = item.get("judul", "")
-                judul, link = parse_judul_link(judul_html)
-
-                baru.append(
-                    {
-                        "id": id_baru,
-                        "judul": judul,
-                        "link": link,
-                        "tanggal": item.get("tanggal", "-"),
-                        "creator": item.get("creator", "-"),
-                        "view": item.get("view", "-"),
-                        "kategori": item.get("kategori", "-"),
-                    }
-                )
-            else:
-                logger.debug(f"🔁 ID lama (sudah ada): {id_baru}")
-
-        total_data = len(data)
-        total_baru = len(baru)
-        total_lama = total_data - total_baru
-
-        logger.info(f"📊 Statistik: total {tipe} dari API: {total_data}")
-        logger.info(f"🆕 ID baru ditemukan: {total_baru}, Lama: {total_lama}")
-
-        if baru:
-            logger.info(f"📢 Ditemukan {total_baru} {tipe} baru.")
-            all_ids = [item.get("id") for item in data]
-            logger.info(f"💾 Cache diperbarui. ID terakhir disimpan: {all_ids}")
-            save_last_ids(cache_file, all_ids)
-        else:
-            logger.info(f"✅ Tidak ditemukan {tipe} baru. Cache tetap.")
-
-        return list(reversed(baru))
+        baru = cari_item_baru(data, cache_file, lambda item: item.get("id"), tipe)
+        # Judul hanya di-parse untuk item yang benar-benar baru, di parse pool
+        return await run_parse(_bersihkan_items, baru) if baru else []
 
     except Exception as e:
         logger.exception(f"❌ Gagal mengambil data {tipe}.")
@@ -0,0 +1,58 @@
+# utils/parse_pool.py
+"""
+Pool worker untuk parsing HTML (CPU-bound) supaya event loop tetap bebas
+memproses moderasi & command lain. Mode & jumlah worker diatur lewat .env:
+  PARSE_POOL=thread|process|inline   (default thread)
+  PARSE_WORKERS=2
+Fungsi yang dikirim ke pool harus top-level (bisa di-pickle untuk mode
+process) dan mengembalikan tipe sederhana (list/dict/str).
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+PARSE_POOL = os.getenv("PARSE_POOL", "thread").strip().lower()
+PARSE_WORKERS = max(1, int(os.getenv("PARSE_WORKERS", str(min(2, os.cpu_count() or 1)))))
+
+_executor: Executor | None = None
+# Batasi job yang antre/jalan supaya halaman besar tidak menumpuk di memori
+_slots: asyncio.Semaphore | None = None
+
+
+def _get_executor() -> Executor | None:
+    global _executor
+    if PARSE_POOL == "inline":
+        return None
+    if _executor is None:
+        if PARSE_POOL == "process":
+            _executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=PARSE_WORKERS, thread_name_prefix="parse"
+            )
+        logger.info("🧵 Parse pool %s dengan %d worker", PARSE_POOL, PARSE_WORKERS)
+    return _executor
+
+
+async def run_parse(fn: Callable, *args):
+    """Jalankan fn(*args) di pool parse; inline kalau PARSE_POOL=inline."""
+    global _slots
+    executor = _get_executor()
+    if executor is None:
+        return fn(*args)
+    if _slots is None:
+        _slots = asyncio.Semaphore(PARSE_WORKERS * 2)
+    async with _slots:
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+
+async def shutdown_parse_pool(*_):
+    """Matikan pool (dipanggil saat bot shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
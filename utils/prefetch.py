@@ -0,0 +1,205 @@
+# utils/prefetch.py
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Awaitable, Callable
+
+from telegram.ext import ContextTypes, JobQueue
+
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Interval default per sumber (detik). Bisa dioverride lewat .env:
+#   PREFETCH_INTERVALS=jadwal=1800,pass1=600
+DEFAULT_INTERVAL = 900
+DEFAULT_INTERVALS = {
+    "jadwal": 1800,
+    "reg": 1800,
+    "pass1": 900,
+    "pass2": 900,
+    "info": 600,
+    "prelim": 600,
+    "kurs": 1800,
+}
+PREFETCH_JITTER = int(os.getenv("PREFETCH_JITTER", "60"))
+
+# Stale-while-revalidate default (detik); tiap sumber bisa set sendiri
+DEFAULT_FRESH_TTL = 900
+DEFAULT_STALE_TTL = 6 * 3600
+
+# key -> coroutine refresh (fetch + parse + simpan cache, return (data, fetched_at, segar))
+_sources: dict[str, Callable[[], Awaitable[tuple]]] = {}
+# key -> (fresh_ttl, stale_ttl)
+_ttls: dict[str, tuple] = {}
+# key -> {"data": list, "updated_at": epoch | None}
+_snapshot: dict[str, dict] = {}
+_background: set = set()
+# Refresh paralel per sumber digabung jadi satu fetch (dan satu penulis cache)
+_flight = SingleFlight()
+# key -> versi data; naik hanya kalau isi snapshot benar-benar berubah
+_versions: dict[str, int] = {}
+# Callback async (key, data) yang dipanggil tiap refresh segar (mis. notifier)
+_listeners: list[Callable[[str, list], Awaitable[None]]] = []
+
+
+def _parse_intervals(raw: str) -> dict[str, int]:
+    hasil = {}
+    for part in (raw or "").replace(";", ",").split(","):
+        key, _, val = part.partition("=")
+        key = key.strip().lower()
+        if not key or not val.strip():
+            continue
+        try:
+            hasil[key] = max(60, int(val))
+        except ValueError:
+            logger.warning("PREFETCH_INTERVALS tidak valid untuk %s: %r", key, val)
+    return hasil
+
+
+INTERVALS = {**DEFAULT_INTERVALS, **_parse_intervals(os.getenv("PREFETCH_INTERVALS"))}
+
+
+def register_source(
+    key: str,
+    refresh: Callable[[], Awaitable[tuple]],
+    fresh_ttl: int = DEFAULT_FRESH_TTL,
+    stale_ttl: int = DEFAULT_STALE_TTL,
+):
+    """
+    refresh() harus return (data, fetched_at, segar):
+      segar=True  → data baru divalidasi ke upstream pada fetched_at (epoch)
+      segar=False → fallback cache; fetched_at = perkiraan umur (mtime) atau None
+    """
+    _sources[key] = refresh
+    _ttls[key] = (fresh_ttl, max(fresh_ttl, stale_ttl))
+
+
+def add_listener(callback: Callable[[str, list], Awaitable[None]]):
+    """Daftarkan callback yang menerima (key, data) setiap refresh segar."""
+    _listeners.append(callback)
+
+
+def get_snapshot(key: str):
+    """Data terakhir di memori, atau None kalau belum pernah di-refresh."""
+    snap = _snapshot.get(key)
+    return snap["data"] if snap else None
+
+
+def data_version(key: str) -> int:
+    """Versi snapshot (0 = belum ada); dipakai untuk invalidasi cache render."""
+    return _versions.get(key, 0)
+
+
+def snapshot_age(key: str):
+    snap = _snapshot.get(key)
+    if not snap or snap["updated_at"] is None:
+        return None
+    return max(0.0, time.time() - snap["updated_at"])
+
+
+def format_umur(detik) -> str:
+    if detik is None:
+        return "waktu tidak diketahui"
+    if detik < 60:
+        return "baru saja"
+    if detik < 3600:
+        return f"{int(detik // 60)} menit lalu"
+    if detik < 86400:
+        return f"{int(detik // 3600)} jam lalu"
+    return f"{int(detik // 86400)} hari lalu"
+
+
+def keterangan_umur(key: str) -> str:
+    """Teks singkat umur data untuk ditempel di balasan command."""
+    return f"🕒 Data diperbarui {format_umur(snapshot_age(key))}"
+
+
+async def refresh_source(key: str) -> list:
+    """Refresh satu sumber; pemanggil yang bersamaan berbagi satu fetch."""
+    return await _flight.do(key, lambda: _refresh_source(key))
+
+
+async def _refresh_source(key: str) -> list:
+    mulai = time.monotonic()
+    try:
+        data, fetched_at, segar = await _sources[key]()
+    except Exception:
+        logger.exception("Refresh %s gagal", key)
+        return get_snapshot(key) or []
+
+    # Fallback cache hanya mengisi snapshot kosong, tidak memperbarui umurnya
+    if data and (segar or key not in _snapshot):
+        lama = _snapshot.get(key)
+        if lama is None or data != lama["data"]:
+            _versions[key] = _versions.get(key, 0) + 1
+        _snapshot[key] = {"data": data, "updated_at": fetched_at}
+    logger.info(
+        "🔁 Refresh %s selesai (%d baris, %.2fs, %s)",
+        key,
+        len(data or []),
+        time.monotonic() - mulai,
+        "segar" if segar else "cache",
+    )
+    if segar and data and _listeners:
+        # Jalan di background supaya pemanggil yang menunggu tidak ikut tertahan
+        task = asyncio.create_task(_beri_tahu(key, data))
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+    return get_snapshot(key) or []
+
+
+async def _beri_tahu(key: str, data: list):
+    for callback in _listeners:
+        try:
+            await callback(key, data)
+        except Exception:
+            logger.exception("Listener refresh %s gagal", key)
+
+
+def _revalidate_background(key: str):
+    if _flight.in_flight(key):
+        return
+    task = asyncio.create_task(refresh_source(key))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+async def read_or_refresh(key: str) -> list:
+    """
+    Stale-while-revalidate untuk handler:
+      - umur < fresh_ttl  → langsung dari memori
+      - umur < stale_ttl  → dari memori + satu revalidasi di background
+      - selain itu        → tunggu refresh (fallback ke data lama kalau gagal)
+    """
+    fresh_ttl, stale_ttl = _ttls.get(key, (DEFAULT_FRESH_TTL, DEFAULT_STALE_TTL))
+    data = get_snapshot(key)
+    umur = snapshot_age(key)
+    if data is not None and umur is not None:
+        if umur < fresh_ttl:
+            return data
+        if umur < stale_ttl:
+            _revalidate_background(key)
+            return data
+    return await refresh_source(key)
+
+
+async def _prefetch_job(context: ContextTypes.DEFAULT_TYPE):
+    await refresh_source(context.job.data)
+
+
+def start_prefetch(job_queue: JobQueue):
+    """Jadwalkan refresher per sumber dengan jitter supaya tidak barengan."""
+    for key in _sources:
+        interval = INTERVALS.get(key, DEFAULT_INTERVAL)
+        job_queue.run_repeating(
+            _prefetch_job,
+            interval=interval,
+            first=5 + random.uniform(0, PREFETCH_JITTER),
+            data=key,
+            name=f"prefetch-{key}",
+            job_kwargs={"jitter": PREFETCH_JITTER, "misfire_grace_time": 60},
+        )
+        logger.info("⏲️ Prefetch %s tiap %ss (jitter %ss)", key, interval, PREFETCH_JITTER)
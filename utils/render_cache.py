@@ -0,0 +1,45 @@
+# utils/render_cache.py
+import logging
+from typing import Callable
+
+from .prefetch import data_version
+
+logger = logging.getLogger(__name__)
+
+
+class RenderCache:
+    """
+    Cache isi pesan yang sudah dirender per (sumber, jumlah, format).
+    Entri dianggap basi begitu versi data sumber di prefetch berubah, jadi
+    command populer cukup lookup dict + kirim. Teks umur data tidak ikut
+    di-cache karena berubah tiap menit.
+    """
+
+    def __init__(self):
+        self._cache: dict[tuple, tuple[int, str]] = {}
+        self.hit = 0
+        self.miss = 0
+
+    def get(self, key: str, jumlah: int, fmt: str, build: Callable[[], str]) -> str:
+        versi = data_version(key)
+        entri = self._cache.get((key, jumlah, fmt))
+        if entri is not None and entri[0] == versi:
+            self.hit += 1
+            return entri[1]
+
+        self.miss += 1
+        body = build()
+        self._cache[(key, jumlah, fmt)] = (versi, body)
+        return body
+
+    def stats(self) -> dict:
+        total = self.hit + self.miss
+        return {
+            "hit": self.hit,
+            "miss": self.miss,
+            "entri": len(self._cache),
+            "hit_rate": self.hit / total if total else 0.0,
+        }
+
+
+render_cache = RenderCache()
@@ -0,0 +1,91 @@
+# utils/respon_router.py
+import difflib
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+
+# Kunci respon.json yang bukan kategori balasan
+KUNCI_KHUSUS = ("mood_swing", "routing")
+
+# Penanda slot mood swing di pool fallback (dipilih lewat random.choice biasa)
+_MOOD_SWING = object()
+
+
+# === Router hasil kompilasi bagian "routing" di respon.json ===
+class ResponRouter:
+    def __init__(self, responses: dict):
+        routing = responses.get("routing") or {}
+
+        # Aturan kata kunci → pool balasan, dirata-kan jadi pasangan
+        # (kata_kunci, pool) terurut prioritas; dicek dengan `in` (level C)
+        aturan_terurut = []
+        for aturan in routing.get("aturan", []):
+            pool = responses.get(aturan.get("kategori")) or aturan.get("default") or []
+            if not isinstance(pool, list) or not pool:
+                logger.warning("Aturan routing tanpa balasan dilewati: %s", aturan)
+                continue
+            pool = tuple(pool)
+            for kunci in aturan.get("kata_kunci", []):
+                if kunci:
+                    aturan_terurut.append((kunci.lower(), pool))
+        self._aturan = tuple(aturan_terurut)
+
+        # Kandidat kategori untuk pencocokan kemiripan (difflib)
+        self._kategori = {}
+        for kunci, isi in responses.items():
+            if kunci in KUNCI_KHUSUS or not isinstance(isi, list) or not isi:
+                continue
+            self._kategori.setdefault(kunci.replace("_", " "), tuple(isi))
+        self._teks_kategori = tuple(self._kategori)
+        self._pool_korea = tuple(responses.get("belajar_korea") or ())
+
+        # Mood swing: tuple per mood
+        mood = responses.get("mood_swing") or {"netral": ["..."]}
+        self._mood = tuple(tuple(isi) for isi in mood.values() if isi) or (("...",),)
+
+        # Pool fallback dirata-kan sekali, slot mood swing pakai penanda
+        fallback = routing.get("fallback") or {}
+        pool = []
+        for kunci in fallback.get("kategori", []):
+            isi = responses.get(kunci)
+            if isinstance(isi, list):
+                pool += isi
+        pool += fallback.get("tambahan", [])
+        if fallback.get("mood_swing", True):
+            pool.append(_MOOD_SWING)
+        self._fallback = tuple(pool) or (_MOOD_SWING,)
+
+    def _mood_swing(self) -> str:
+        return random.choice(random.choice(self._mood))
+
+    def _cari_kategori(self, teks: str):
+        cocok = difflib.get_close_matches(
+            " ".join(teks.split()), self._teks_kategori, n=1, cutoff=0.7
+        )
+        if cocok:
+            return self._kategori[cocok[0]]
+        if "korea" in teks and self._pool_korea:
+            return self._pool_korea
+        return None
+
+    def _cocok_aturan(self, teks: str):
+        for kunci, pool in self._aturan:
+            if kunci in teks:
+                return pool
+        return None
+
+    def pilih(self, teks: str) -> str:
+        """Pilih balasan untuk teks (sudah lowercase)."""
+        pool = self._cocok_aturan(teks)
+        if pool is not None:
+            return random.choice(pool)
+
+        pool = self._cari_kategori(teks)
+        if pool:
+            return random.choice(pool)
+
+        balasan = random.choice(self._fallback)
+        if balasan is _MOOD_SWING:
+            return self._mood_swing()
+        return balasan
@@ -0,0 +1,93 @@
+# utils/response_store.py
+import asyncio
+import json
+import logging
+import os
+import threading
+
+from telegram.ext import ContextTypes
+
+from .constants import RESPON_FILE
+from .respon_router import ResponRouter
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_CEK_RESPON = 30  # detik
+
+
+class ResponseStore:
+    """
+    Satu sumber respon.json untuk responder.
+    File dibaca saat pertama dipakai, lalu dimuat ulang kalau mtime berubah.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._data = {}
+        self._router = None
+
+    def _baca(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        if not isinstance(data, dict):
+            raise ValueError("respon.json harus berupa object dict")
+        return data
+
+    def _muat(self, mtime):
+        data = self._baca()
+        router = ResponRouter(data)
+        # Tukar semua view sekaligus supaya pembaca tidak lihat data setengah jadi
+        self._data, self._router = data, router
+        self._mtime = mtime
+
+    def _mtime_file(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def refresh(self) -> bool:
+        """Muat ulang kalau file berubah. Return True jika ada reload."""
+        mtime = self._mtime_file()
+        if self._router is not None and mtime == self._mtime:
+            return False
+        with self._lock:
+            if self._router is not None and mtime == self._mtime:
+                return False
+            try:
+                self._muat(mtime)
+            except Exception:
+                logger.exception("Gagal memuat %s, tetap pakai versi lama", self.path)
+                if self._router is None:
+                    self._router = ResponRouter({})
+                self._mtime = mtime
+                return False
+        logger.info("🔄 %s dimuat (%d kategori)", self.path, len(self._data))
+        return True
+
+    def _pastikan_termuat(self):
+        if self._router is None:
+            self.refresh()
+
+    # === View per konsumen ===
+    @property
+    def data(self) -> dict:
+        self._pastikan_termuat()
+        return self._data
+
+    @property
+    def router(self) -> ResponRouter:
+        self._pastikan_termuat()
+        return self._router
+
+    async def cek_perubahan(self, context: ContextTypes.DEFAULT_TYPE):
+        """Callback JobQueue: cek mtime & reload di thread terpisah."""
+        await asyncio.to_thread(self.refresh)
+
+
+response_store = ResponseStore(RESPON_FILE)
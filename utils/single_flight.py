@@ -0,0 +1,30 @@
+# utils/single_flight.py
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Gabungkan pemanggilan paralel dengan key yang sama: hanya satu coroutine
+    yang benar-benar jalan, pemanggil lain menunggu & ikut memakai hasilnya.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: str, fn: Callable[[], Awaitable]):
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(fn())
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.debug("⏳ %s sedang di-fetch, ikut menunggu hasilnya", key)
+        # shield: pemanggil yang dibatalkan tidak ikut membatalkan fetch bersama
+        return await asyncio.shield(fut)
@@ -0,0 +1,387 @@
+# utils/state_db.py
+"""
+Backend state opsional di SQLite (STATE_BACKEND=sqlite): satu koneksi per
+proses (WAL), tabel bertipe untuk ban, strike, link phishing, keyword
+moderasi, config autoreply, mapping topik & snapshot akun, plus tabel
+`dokumen` untuk cache scraper. utils/json_store.py meneruskan baca/tulis
+file data/*.json ke sini, jadi kode lama tetap memakai path yang sama:
+  - tulis = diff dengan isi tabel lalu INSERT/UPDATE/DELETE baris yang berubah saja
+  - baca = query tabel; path yang belum pernah dimigrasi jatuh ke file JSON
+  - config yang diedit manual (IMPOR_ULANG) diimpor ulang saat file-nya
+    lebih baru dari tulis DB terakhir
+Migrasi sekali jalan: python tools/migrate_state.py
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from .constants import (
+    AUTOREPLY_FILE,
+    BANNED_FILE,
+    MODERATION_FILE,
+    PHISHING_CACHE_FILE,
+    STATE_DB,
+    TOPIK_ID,
+)
+
+logger = logging.getLogger(__name__)
+
+STATE_BACKEND = os.getenv("STATE_BACKEND", "json").strip().lower()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    path TEXT PRIMARY KEY,          -- file JSON asal; ada baris = sudah dikelola DB
+    diubah REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dokumen (
+    path TEXT PRIMARY KEY,
+    isi TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS banned_users (
+    user_id INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS strikes (
+    user_id INTEGER PRIMARY KEY,
+    timestamps TEXT NOT NULL        -- JSON list ISO waktu strike
+);
+CREATE TABLE IF NOT EXISTS phishing_links (
+    link TEXT PRIMARY KEY,
+    verdict TEXT NOT NULL DEFAULT 'phishing'
+);
+CREATE TABLE IF NOT EXISTS moderation_keywords (
+    kategori TEXT NOT NULL,
+    kata TEXT NOT NULL,
+    PRIMARY KEY (kategori, kata)
+);
+CREATE TABLE IF NOT EXISTS autoreply_chats (
+    chat_id TEXT PRIMARY KEY,
+    config TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS autoreply_meta (
+    kunci TEXT PRIMARY KEY,
+    nilai TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS topic_ids (
+    kunci TEXT PRIMARY KEY,
+    thread_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS account_snapshots (
+    id INTEGER PRIMARY KEY,
+    log TEXT NOT NULL,              -- auto / manual
+    uid TEXT NOT NULL,
+    akun TEXT NOT NULL,
+    t REAL NOT NULL,
+    ts TEXT NOT NULL,
+    h TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshot_akun ON account_snapshots (log, uid, akun, id);
+"""
+
+_KATEGORI = ("BAN_KEYWORDS", "BAD_WORDS", "SENSITIF")
+# Config yang biasa diedit dengan tangan: file JSON yang lebih baru dari tulis
+# DB terakhir diimpor ulang saat dibaca, jadi edit tetap kebaca tanpa migrasi
+IMPOR_ULANG = (AUTOREPLY_FILE, MODERATION_FILE, TOPIK_ID)
+
+
+def _teks(data) -> str:
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+class StateDB:
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Satu koneksi dipakai bersama event loop & worker thread, diserialisasi lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        # path file JSON -> (baca, tulis) tabel bertipe; sisanya ke tabel dokumen
+        self._impor_gagal: dict[str, float] = {}  # path -> mtime file yang gagal diimpor
+        self._adapter = {
+            BANNED_FILE: (self._baca_banned, self._tulis_banned),
+            PHISHING_CACHE_FILE: (self._baca_phishing, self._tulis_phishing),
+            MODERATION_FILE: (self._baca_keywords, self._tulis_keywords),
+            AUTOREPLY_FILE: (self._baca_autoreply, self._tulis_autoreply),
+            TOPIK_ID: (self._baca_topik, self._tulis_topik),
+        }
+
+    def _q(self, sql: str, params=()):
+        return self._conn.execute(sql, params)
+
+    def _transaksi(self, fn, *args):
+        with self._lock:
+            self._q("BEGIN IMMEDIATE")
+            try:
+                hasil = fn(*args)
+            except BaseException:
+                self._q("ROLLBACK")
+                raise
+            self._q("COMMIT")
+            return hasil
+
+    # === Dokumen (dipakai json_store) ===
+    def baca_dokumen(self, path: str):
+        """Isi dokumen untuk path ini; None kalau path belum dikelola DB."""
+        with self._lock:
+            if self._q("SELECT 1 FROM meta WHERE path = ?", (path,)).fetchone() is None:
+                return None
+            baca, _ = self._adapter.get(path, (None, None))
+            if baca is not None:
+                return baca()
+            row = self._q("SELECT isi FROM dokumen WHERE path = ?", (path,)).fetchone()
+            return json.loads(row["isi"]) if row else None
+
+    def tulis_dokumen(self, path: str, data) -> int:
+        """Simpan dokumen; return jumlah baris yang benar-benar berubah."""
+
+        def jalan():
+            _, tulis = self._adapter.get(path, (None, None))
+            n = tulis(data) if tulis is not None else self._tulis_dokumen(path, data)
+            self._q(
+                "INSERT INTO meta (path, diubah) VALUES (?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET diubah = excluded.diubah",
+                (path, time.time()),
+            )
+            return n
+
+        return self._transaksi(jalan)
+
+    def impor_kalau_baru(self, path: str) -> bool:
+        """
+        Kalau file JSON di `path` diedit setelah tulis DB terakhir, impor ulang
+        isinya. Return True kalau ada impor. Path yang belum dikelola DB dilewati
+        (pembaca memang masih memakai file-nya).
+        """
+        mtime_db = self.mtime(path)
+        if mtime_db is None:
+            return False
+        try:
+            mtime_file = os.path.getmtime(path)
+        except OSError:
+            return False
+        if mtime_file <= mtime_db or self._impor_gagal.get(path) == mtime_file:
+            return False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # sekali log per versi file, jangan tiap baca
+            self._impor_gagal[path] = mtime_file
+            logger.warning("Gagal impor ulang %s, tetap pakai isi DB", path, exc_info=True)
+            return False
+        n = self.tulis_dokumen(path, data)
+        logger.info("📥 %s diedit manual, diimpor ulang ke DB (%d baris berubah)", path, n)
+        return True
+
+    def mtime(self, path: str):
+        with self._lock:
+            row = self._q("SELECT diubah FROM meta WHERE path = ?", (path,)).fetchone()
+        return row["diubah"] if row else None
+
+    def _tulis_dokumen(self, path: str, data) -> int:
+        cur = self._q(
+            "INSERT INTO dokumen (path, isi) VALUES (?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET isi = excluded.isi WHERE isi != excluded.isi",
+            (path, _teks(data)),
+        )
+        return cur.rowcount
+
+    # === Diff set / dict ke baris ===
+    def _diff_set(self, tabel: str, kolom: str, lama: set, baru: set) -> int:
+        tambah, hapus = baru - lama, lama - baru
+        self._conn.executemany(
+            f"INSERT OR IGNORE INTO {tabel} ({kolom}) VALUES (?)", [(x,) for x in tambah]
+        )
+        self._conn.executemany(f"DELETE FROM {tabel} WHERE {kolom} = ?", [(x,) for x in hapus])
+        return len(tambah) + len(hapus)
+
+    def _diff_dict(self, tabel: str, kunci: str, nilai: str, lama: dict, baru: dict) -> int:
+        ubah = [(k, v) for k, v in baru.items() if k not in lama or lama[k] != v]
+        hapus = [(k,) for k in lama.keys() - baru.keys()]
+        self._conn.executemany(
+            f"INSERT INTO {tabel} ({kunci}, {nilai}) VALUES (?, ?) "
+            f"ON CONFLICT({kunci}) DO UPDATE SET {nilai} = excluded.{nilai}",
+            ubah,
+        )
+        self._conn.executemany(f"DELETE FROM {tabel} WHERE {kunci} = ?", hapus)
+        return len(ubah) + len(hapus)
+
+    # === Ban ===
+    def _baca_banned(self) -> list:
+        return [r[0] for r in self._q("SELECT user_id FROM banned_users ORDER BY rowid")]
+
+    def _tulis_banned(self, data) -> int:
+        return self._diff_set(
+            "banned_users", "user_id", set(self._baca_banned()), {int(u) for u in data or []}
+        )
+
+    # === Link phishing ===
+    def _baca_phishing(self) -> list:
+        return [r[0] for r in self._q("SELECT link FROM phishing_links ORDER BY rowid")]
+
+    def _tulis_phishing(self, data) -> int:
+        return self._diff_set(
+            "phishing_links", "link", set(self._baca_phishing()), set(data or [])
+        )
+
+    # === Keyword moderasi ===
+    def _baca_keywords(self) -> dict:
+        hasil = {k: [] for k in _KATEGORI}
+        for r in self._q("SELECT kategori, kata FROM moderation_keywords ORDER BY rowid"):
+            hasil.setdefault(r["kategori"], []).append(r["kata"])
+        return hasil
+
+    def _tulis_keywords(self, data) -> int:
+        lama = {(k, w) for k, kata in self._baca_keywords().items() for w in kata}
+        urut = [(k, w) for k, kata in (data or {}).items() for w in kata]
+        # urutan daftar asli dipertahankan lewat rowid
+        tambah = [x for x in dict.fromkeys(urut) if x not in lama]
+        hapus = lama - set(urut)
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO moderation_keywords (kategori, kata) VALUES (?, ?)", tambah
+        )
+        self._conn.executemany(
+            "DELETE FROM moderation_keywords WHERE kategori = ? AND kata = ?", hapus
+        )
+        return len(tambah) + len(hapus)
+
+    # === Autoreply ===
+    def _baca_autoreply(self) -> dict:
+        data = {r["kunci"]: json.loads(r["nilai"]) for r in self._q("SELECT * FROM autoreply_meta")}
+        data["chats"] = {
+            r["chat_id"]: json.loads(r["config"])
+            for r in self._q("SELECT chat_id, config FROM autoreply_chats ORDER BY rowid")
+        }
+        return data
+
+    def _tulis_autoreply(self, data) -> int:
+        data = dict(data or {})
+        chats = {str(k): _teks(v) for k, v in (data.pop("chats", None) or {}).items()}
+        meta = {k: _teks(v) for k, v in data.items()}
+        lama_chats = {r[0]: r[1] for r in self._q("SELECT chat_id, config FROM autoreply_chats")}
+        lama_meta = {r[0]: r[1] for r in self._q("SELECT kunci, nilai FROM autoreply_meta")}
+        return self._diff_dict(
+            "autoreply_chats", "chat_id", "config", lama_chats, chats
+        ) + self._diff_dict("autoreply_meta", "kunci", "nilai", lama_meta, meta)
+
+    # === Mapping topik ===
+    def _baca_topik(self) -> dict:
+        return {r[0]: r[1] for r in self._q("SELECT kunci, thread_id FROM topic_ids ORDER BY rowid")}
+
+    def _tulis_topik(self, data) -> int:
+        return self._diff_dict("topic_ids", "kunci", "thread_id", self._baca_topik(), dict(data or {}))
+
+    # === Strike (hanya di backend SQLite; backend JSON menyimpannya di memori saja) ===
+    def muat_strike(self) -> dict[int, list]:
+        with self._lock:
+            return {
+                r["user_id"]: json.loads(r["timestamps"])
+                for r in self._q("SELECT user_id, timestamps FROM strikes")
+            }
+
+    def simpan_strike(self, user_id: int, timestamps: list):
+        with self._lock:
+            if timestamps:
+                self._q(
+                    "INSERT INTO strikes (user_id, timestamps) VALUES (?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET timestamps = excluded.timestamps",
+                    (user_id, json.dumps(timestamps)),
+                )
+            else:
+                self._q("DELETE FROM strikes WHERE user_id = ?", (user_id,))
+
+    def hapus_semua_strike(self):
+        with self._lock:
+            self._q("DELETE FROM strikes")
+
+    # === Snapshot akun (handlers/cache_utils.py) ===
+    def snapshot_terakhir(self, log: str, uid: str, akun: str):
+        with self._lock:
+            return self._q(
+                "SELECT ts, h, data FROM account_snapshots "
+                "WHERE log = ? AND uid = ? AND akun = ? ORDER BY id DESC LIMIT 1",
+                (log, uid, akun),
+            ).fetchone()
+
+    def snapshot_tambah(self, log: str, uid: str, akun: str, rekaman: dict):
+        with self._lock:
+            self._q(
+                "INSERT INTO account_snapshots (log, uid, akun, t, ts, h, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    log,
+                    uid,
+                    akun,
+                    rekaman["t"],
+                    rekaman["ts"],
+                    rekaman["h"],
+                    json.dumps(rekaman["data"], ensure_ascii=False),
+                ),
+            )
+
+    def snapshot_pangkas_akun(self, log: str, uid: str, akun: str, simpan_n: int) -> int:
+        with self._lock:
+            return self._q(
+                "DELETE FROM account_snapshots WHERE log = ? AND uid = ? AND akun = ? AND id < ("
+                " SELECT MIN(id) FROM (SELECT id FROM account_snapshots"
+                "  WHERE log = ? AND uid = ? AND akun = ? ORDER BY id DESC LIMIT ?))",
+                (log, uid, akun, log, uid, akun, simpan_n),
+            ).rowcount
+
+    def snapshot_riwayat(self, log: str, uid: str, akun: str) -> list:
+        with self._lock:
+            return self._q(
+                "SELECT ts, data FROM account_snapshots "
+                "WHERE log = ? AND uid = ? AND akun = ? ORDER BY id",
+                (log, uid, akun),
+            ).fetchall()
+
+    def snapshot_jumlah(self, log: str) -> int:
+        """Jumlah snapshot di log ini (0 = belum pernah dimigrasi)."""
+        with self._lock:
+            return self._q(
+                "SELECT COUNT(*) FROM account_snapshots WHERE log = ?", (log,)
+            ).fetchone()[0]
+
+    def snapshot_pangkas(self, log: str, simpan_n: int, batas_t: float | None) -> int:
+        """Hapus snapshot di luar retensi; snapshot terakhir tiap akun selalu disimpan."""
+
+        def jalan():
+            n = 0
+            if simpan_n > 0:
+                n += self._q(
+                    "DELETE FROM account_snapshots WHERE id IN ("
+                    " SELECT id FROM (SELECT id, ROW_NUMBER() OVER ("
+                    "  PARTITION BY uid, akun ORDER BY id DESC) AS urut"
+                    "  FROM account_snapshots WHERE log = ?) WHERE urut > ?)",
+                    (log, simpan_n),
+                ).rowcount
+            if batas_t is not None:
+                n += self._q(
+                    "DELETE FROM account_snapshots WHERE log = ? AND t < ? AND id NOT IN ("
+                    " SELECT MAX(id) FROM account_snapshots WHERE log = ? GROUP BY uid, akun)",
+                    (log, batas_t, log),
+                ).rowcount
+            return n
+
+        return self._transaksi(jalan)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+state_db = StateDB(STATE_DB) if STATE_BACKEND == "sqlite" else None
+
+
+async def close_state_db(*_):
+    if state_db is not None:
+        state_db.close()
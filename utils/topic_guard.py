@@ -1,7 +1,5 @@
 # utils/topic_guard.py
-import json
 import logging
-from pathlib import Path
 from telegram import Update
 from telegram.constants import ParseMode
 from telegram.ext import ContextTypes
@@ -9,6 +7,7 @@ from dotenv import load_dotenv
 import os
 
 from .constants import TOPIK_ID  # -> Path ke data/topik_ids.json
+from .json_store import baca_json
 
 logger = logging.getLogger(__name__)
 load_dotenv()
@@ -28,11 +27,13 @@ def _normalize_key(k: str) -> str:
 def _load_topik_mapping() -> dict:
     """
     Selalu load saat dipanggil (biar perubahan JSON kebaca tanpa restart).
+    Dengan STATE_BACKEND=sqlite, file yang diedit diimpor ulang ke DB dulu
+    oleh baca_json.
     """
     try:
-        path = Path(TOPIK_ID)
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = baca_json(TOPIK_ID)
+        if data is None:
+            raise FileNotFoundError(TOPIK_ID)
         if not isinstance(data, dict):
             logger.error("topik_ids.json bukan object dict.")
             return {}
@@ -60,6 +61,16 @@ def _resolve_thread_id(mapping: dict, command_key: str):
     return None
 
 
+def get_thread_id(*command_keys: str):
+    """Thread id pertama yang terkonfigurasi untuk salah satu key (urut prioritas)."""
+    mapping = _load_topik_mapping()
+    for key in command_keys:
+        thread_id = _resolve_thread_id(mapping, key)
+        if thread_id is not None:
+            return thread_id
+    return None
+
+
 async def handle_thread_guard(
     command_key: str, update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> bool: